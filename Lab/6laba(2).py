@@ -1,5 +1,9 @@
 import math
+import sys
 import time
+from collections import OrderedDict
+
+REC_LIMIT = 25
 
 def get_fact(n):
     b = 1  
@@ -17,6 +21,84 @@ def F_rec(n):
     term2 = F_rec(n - 3) / math.factorial(2 * n)
     return sign * (term1 + term2)
 
+REC_CACHE_SIZE = 1024
+rec_cache = OrderedDict()
+rec_stats = {"hits": 0, "misses": 0}
+inv_facts = [1.0]
+last_fact = 1
+
+def inv_fact(k):
+    # 1/k! с точным округлением (int/int); после ухода в 0.0 таблица не растёт
+    global last_fact
+    while len(inv_facts) <= k and inv_facts[-1]:
+        last_fact *= len(inv_facts)
+        inv_facts.append(1 / last_fact)
+    return inv_facts[k] if k < len(inv_facts) else 0.0
+
+def set_rec_cache_size(maxsize):
+    global REC_CACHE_SIZE
+    if maxsize < 1:
+        raise ValueError("размер кэша должен быть положительным")
+    REC_CACHE_SIZE = maxsize
+    while len(rec_cache) > maxsize:
+        rec_cache.popitem(last=False)
+
+def _F_known(k, known):
+    # known — значения текущего вызова, поэтому каждое F(k) считается
+    # один раз при любом размере кэша; LRU переносит значения между вызовами
+    if k < 2:
+        return 1
+    value = known.get(k)
+    if value is None:
+        value = rec_cache.get(k)
+        if value is None:
+            rec_stats["misses"] += 1
+            return None
+        rec_cache.move_to_end(k)
+        rec_stats["hits"] += 1
+        known[k] = value
+    return value
+
+def _F_store(k, known):
+    sign = -1 if k % 2 else 1
+    value = sign * (2 * _F_known(k - 1, known) * inv_fact(k)
+                    + _F_known(k - 3, known) * inv_fact(2 * k))
+    known[k] = value
+    rec_cache[k] = value
+    if len(rec_cache) > REC_CACHE_SIZE:
+        rec_cache.popitem(last=False)
+    return value
+
+def _F_memo(n, known):
+    value = _F_known(n, known)
+    if value is None:
+        _F_memo(n - 1, known)
+        _F_memo(n - 3, known)
+        value = _F_store(n, known)
+    return value
+
+def F_rec_stack(n):
+    # Та же рекурсия на явном стеке: (k, True) — зависимости уже посчитаны
+    known = {}
+    stack = [(n, False)]
+    while stack:
+        k, ready = stack.pop()
+        if ready:
+            _F_store(k, known)
+        elif _F_known(k, known) is None:
+            stack += [(k, True), (k - 3, False), (k - 1, False)]
+    return _F_known(n, known)
+
+def F_rec_memo(n):
+    # Глубина рекурсии равна n, поэтому ближе половины лимита — явный стек
+    if n > sys.getrecursionlimit() // 2:
+        return F_rec_stack(n)
+    return _F_memo(n, {})
+
+def rec_cache_report():
+    return (f"Кэш рекурсии: попаданий {rec_stats['hits']}, промахов {rec_stats['misses']}, "
+            f"занято {len(rec_cache)}/{REC_CACHE_SIZE}")
+
 def F_iter(n):
     f = f0 = f1 = f2 = 1
     f2n = 2
@@ -30,21 +112,38 @@ def F_iter(n):
     return f0
 
 def compare(n_max):
-    print(f"{'n':<3} | {'Итерационное':<22} | {'Рекурсия':<27} | {'Время итерации':<19} | {'Время рекурсии':<19}")
-    print("-" * 110)
+    print(f"{'n':<3} | {'Итерационное':<22} | {'Рекурсия':<22} | {'Рекурсия с кэшем':<22} | "
+          f"{'Время итерации':<15} | {'Время рекурсии':<15} | {'Время с кэшем':<15}")
+    print("-" * 139)
     for n in range(n_max + 1):
         try:
             start = time.perf_counter()
-            fi = F_iter(n)
-            t1 = (time.perf_counter() - start) * 1000
+            it = f"{F_iter(n):<22.14e}"
+            t1 = f"{(time.perf_counter() - start) * 1000:<15.5f}"
+        except OverflowError:
+            it, t1 = f"{'OverflowError':<22}", f"{'-'*15}"
 
-            start = time.perf_counter()
-            fr = F_rec(n)
-            t2 = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        fm = F_rec_memo(n)
+        t3 = (time.perf_counter() - start) * 1000
 
-            print(f"{n:<3} | {fi:<22.14e} | {fr:<27.14e} | {t1:<19.5f} | {t2:<19.5f}")
-        except RecursionError:
-            print(f"{n:<3} | {'-'*22} | {'RecursionError':<32} | {'-'*19} | {'-'*19}")
+        # Простая рекурсия экспоненциальна — считаем её только до REC_LIMIT
+        if n > REC_LIMIT:
+            rec, t2 = f"{'-'*22}", f"{'-'*15}"
+        else:
+            try:
+                start = time.perf_counter()
+                rec = f"{F_rec(n):<22.14e}"
+                t2 = f"{(time.perf_counter() - start) * 1000:<15.5f}"
+            except RecursionError:
+                rec, t2 = f"{'RecursionError':<22}", f"{'-'*15}"
+        print(f"{n:<3} | {it} | {rec} | {fm:<22.14e} | {t1} | {t2} | {t3:<15.5f}")
+    print(rec_cache_report())
 
 if __name__ == "__main__":
-    compare(20)
+    if len(sys.argv) > 2:
+        try:
+            set_rec_cache_size(int(sys.argv[2]))
+        except ValueError as e:
+            sys.exit(f"Ошибка: {e}")
+    compare(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -1,5 +1,11 @@
 import math
+import sys
 import time
+import argparse
+from collections import OrderedDict
+from fractions import Fraction
+
+REC_LIMIT = 25
 
 def get_fact(n):
     b = 1  
@@ -17,42 +23,153 @@ def F_rec(n):
     term2 = F_rec(n - 3) / get_fact(2 * n)
     return sign * (term1 + term2)
 
-def F_iter(n):
-    if n < 2:
+REC_CACHE_SIZE = 1024
+rec_cache = OrderedDict()
+rec_stats = {"hits": 0, "misses": 0}
+inv_facts = [1.0]
+last_fact = 1
+
+def inv_fact(k):
+    # 1/k! с точным округлением (int/int); после ухода в 0.0 таблица не растёт
+    global last_fact
+    while len(inv_facts) <= k and inv_facts[-1]:
+        last_fact *= len(inv_facts)
+        inv_facts.append(1 / last_fact)
+    return inv_facts[k] if k < len(inv_facts) else 0.0
+
+def set_rec_cache_size(maxsize):
+    global REC_CACHE_SIZE
+    if maxsize < 1:
+        raise ValueError("размер кэша должен быть положительным")
+    REC_CACHE_SIZE = maxsize
+    while len(rec_cache) > maxsize:
+        rec_cache.popitem(last=False)
+
+def _F_known(k, known):
+    # known — значения текущего вызова, поэтому каждое F(k) считается
+    # один раз при любом размере кэша; LRU переносит значения между вызовами
+    if k < 2:
         return 1
-    f = [1, 1, 1] 
-    
-    for i in range(2, n + 1):
-        sign = -1 if i % 2 else 1
-        if i == 2:
-            term1 = 2 * f[1] / get_fact(i)
-            term2 = 1 / get_fact(2 * i)  
+    value = known.get(k)
+    if value is None:
+        value = rec_cache.get(k)
+        if value is None:
+            rec_stats["misses"] += 1
+            return None
+        rec_cache.move_to_end(k)
+        rec_stats["hits"] += 1
+        known[k] = value
+    return value
+
+def _F_store(k, known):
+    sign = -1 if k % 2 else 1
+    value = sign * (2 * _F_known(k - 1, known) * inv_fact(k)
+                    + _F_known(k - 3, known) * inv_fact(2 * k))
+    known[k] = value
+    rec_cache[k] = value
+    if len(rec_cache) > REC_CACHE_SIZE:
+        rec_cache.popitem(last=False)
+    return value
+
+def _F_memo(n, known):
+    value = _F_known(n, known)
+    if value is None:
+        _F_memo(n - 1, known)
+        _F_memo(n - 3, known)
+        value = _F_store(n, known)
+    return value
+
+def F_rec_stack(n):
+    # Та же рекурсия на явном стеке: (k, True) — зависимости уже посчитаны
+    known = {}
+    stack = [(n, False)]
+    while stack:
+        k, ready = stack.pop()
+        if ready:
+            _F_store(k, known)
+        elif _F_known(k, known) is None:
+            stack += [(k, True), (k - 3, False), (k - 1, False)]
+    return _F_known(n, known)
+
+def F_rec_memo(n):
+    # Глубина рекурсии равна n, поэтому ближе половины лимита — явный стек
+    if n > sys.getrecursionlimit() // 2:
+        return F_rec_stack(n)
+    return _F_memo(n, {})
+
+def rec_cache_report():
+    return (f"Кэш рекурсии: попаданий {rec_stats['hits']}, промахов {rec_stats['misses']}, "
+            f"занято {len(rec_cache)}/{REC_CACHE_SIZE}")
+
+def F_sequence(n_max, exact=False):
+    # Поток F(0), F(1), ..., F(n_max) за один проход: i! и (2i)! переносятся
+    # с прошлого шага, а не считаются заново. В режиме float факториалы тоже
+    # float и после 170! становятся inf, так что слагаемые уходят в 0 без
+    # OverflowError; exact=True считает точно в Fraction
+    one = Fraction(1) if exact else 1.0
+    f3, f2, f1 = one, one, one
+    fact = 1 if exact else 1.0
+    fact2 = 2 if exact else 2.0
+    for i in range(n_max + 1):
+        if i < 2:
+            value = one
         else:
-            term1 = 2 * f[2] / get_fact(i)
-            term2 = f[0] / get_fact(2 * i)
-        new_val = sign * (term1 + term2)
-        
-        if i >= 2:
-            f[0], f[1], f[2] = f[1], f[2], new_val
-    
-    return f[2]
-
-def compare(n_max):
-    print(f"{'n':<3} | {'Итерационное':<22} | {'Рекурсия':<32} | {'Время итерации':<19} | {'Время рекурсии':<19}")
-    print("-" * 110)
+            fact *= i
+            fact2 *= (2 * i - 1) * (2 * i)
+            value = 2 * f1 / fact + f3 / fact2
+            if i % 2:
+                value = -value
+        f3, f2, f1 = f2, f1, value
+        yield value
+
+def F_iter(n, exact=False):
+    if n < 2:
+        return 1
+    for value in F_sequence(n, exact):
+        pass
+    return value
+
+def compare(n_max, exact=False):
+    # Итерационные значения берутся из одного потока F_sequence; время
+    # итерации — накопленное время получения F(n). Простая рекурсия
+    # экспоненциальна, поэтому считается только до REC_LIMIT; рекурсия
+    # с кэшем идёт по всей таблице
+    w = max(3, len(str(n_max)))
+    print(f"{'n':<{w}} | {'Итерационное':<22} | {'Рекурсия':<22} | {'Рекурсия с кэшем':<22} | "
+          f"{'Время итерации':<15} | {'Время рекурсии':<15} | {'Время с кэшем':<15}")
+    print("-" * (136 + w))
+    sequence = F_sequence(n_max, exact)
+    elapsed = 0.0
     for n in range(n_max + 1):
-        try:
-            start = time.perf_counter()
-            fi = F_iter(n)
-            t1 = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        fi = next(sequence)
+        elapsed += time.perf_counter() - start
+        t1 = elapsed * 1000
 
-            start = time.perf_counter()
-            fr = F_rec(n)
-            t2 = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        fm = F_rec_memo(n)
+        t3 = (time.perf_counter() - start) * 1000
 
-            print(f"{n:<3} | {fi:<22.14e} | {fr:<32.14e} | {t1:<19.5f} | {t2:<19.5f}")
-        except RecursionError:
-            print(f"{n:<3} | {'-'*22} | {'RecursionError':<32} | {'-'*19} | {'-'*19}")
+        if n > REC_LIMIT:
+            rec, t2 = f"{'-'*22}", f"{'-'*15}"
+        else:
+            try:
+                start = time.perf_counter()
+                rec = f"{F_rec(n):<22.14e}"
+                t2 = f"{(time.perf_counter() - start) * 1000:<15.5f}"
+            except RecursionError:
+                rec, t2 = f"{'RecursionError':<22}", f"{'-'*15}"
+        print(f"{n:<{w}} | {float(fi):<22.14e} | {rec} | {fm:<22.14e} | {t1:<15.5f} | {t2} | {t3:<15.5f}")
+    print(rec_cache_report())
 
 if __name__ == "__main__":
-    compare(20)
+    parser = argparse.ArgumentParser(description="Сравнение итерационного и рекурсивного F(n)")
+    parser.add_argument("n_max", type=int, nargs="?", default=20)
+    parser.add_argument("--exact", action="store_true", help="точные дроби вместо float")
+    parser.add_argument("--cache", type=int, default=REC_CACHE_SIZE, help="размер LRU-кэша рекурсии")
+    args = parser.parse_args()
+    try:
+        set_rec_cache_size(args.cache)
+    except ValueError as e:
+        parser.error(str(e))
+    compare(args.n_max, args.exact)
@@ -1,5 +1,7 @@
 import math
+import sys
 import time
+from collections import OrderedDict
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 
@@ -19,6 +21,89 @@ def F_rec(n):
     term2 = F_rec(n - 3) / get_fact(2 * n)
     return sign * (term1 + term2)
 
+REC_LIMIT = 25
+REC_CACHE_SIZE = 1024
+rec_cache = OrderedDict()
+rec_stats = {"hits": 0, "misses": 0}
+inv_facts = [1.0]
+last_fact = 1
+
+def inv_fact(k):
+    # 1/k! с точным округлением (int/int); после ухода в 0.0 таблица не растёт
+    global last_fact
+    while len(inv_facts) <= k and inv_facts[-1]:
+        last_fact *= len(inv_facts)
+        inv_facts.append(1 / last_fact)
+    return inv_facts[k] if k < len(inv_facts) else 0.0
+
+def set_rec_cache_size(maxsize):
+    global REC_CACHE_SIZE
+    if maxsize < 1:
+        raise ValueError("размер кэша должен быть положительным")
+    REC_CACHE_SIZE = maxsize
+    while len(rec_cache) > maxsize:
+        rec_cache.popitem(last=False)
+
+def clear_rec_cache():
+    rec_cache.clear()
+    rec_stats["hits"] = rec_stats["misses"] = 0
+
+def _F_known(k, known):
+    # known — значения текущего вызова, поэтому каждое F(k) считается
+    # один раз при любом размере кэша; LRU переносит значения между вызовами
+    if k < 2:
+        return 1
+    value = known.get(k)
+    if value is None:
+        value = rec_cache.get(k)
+        if value is None:
+            rec_stats["misses"] += 1
+            return None
+        rec_cache.move_to_end(k)
+        rec_stats["hits"] += 1
+        known[k] = value
+    return value
+
+def _F_store(k, known):
+    sign = -1 if k % 2 else 1
+    value = sign * (2 * _F_known(k - 1, known) * inv_fact(k)
+                    + _F_known(k - 3, known) * inv_fact(2 * k))
+    known[k] = value
+    rec_cache[k] = value
+    if len(rec_cache) > REC_CACHE_SIZE:
+        rec_cache.popitem(last=False)
+    return value
+
+def _F_memo(n, known):
+    value = _F_known(n, known)
+    if value is None:
+        _F_memo(n - 1, known)
+        _F_memo(n - 3, known)
+        value = _F_store(n, known)
+    return value
+
+def F_rec_stack(n):
+    # Та же рекурсия на явном стеке: (k, True) — зависимости уже посчитаны
+    known = {}
+    stack = [(n, False)]
+    while stack:
+        k, ready = stack.pop()
+        if ready:
+            _F_store(k, known)
+        elif _F_known(k, known) is None:
+            stack += [(k, True), (k - 3, False), (k - 1, False)]
+    return _F_known(n, known)
+
+def F_rec_memo(n):
+    # Глубина рекурсии равна n, поэтому ближе половины лимита — явный стек
+    if n > sys.getrecursionlimit() // 2:
+        return F_rec_stack(n)
+    return _F_memo(n, {})
+
+def rec_cache_report():
+    return (f"Кэш рекурсии: попаданий {rec_stats['hits']}, промахов {rec_stats['misses']}, "
+            f"занято {len(rec_cache)}/{REC_CACHE_SIZE}")
+
 def F_iter(n):
     if n < 2:
         return 1
@@ -44,43 +129,53 @@ def compare_performance():
         n_max = int(max_n_entry.get())
         if n_max < 0:
             raise ValueError("n должно быть неотрицательным")
+        set_rec_cache_size(int(cache_entry.get()))
     except ValueError as e:
         messagebox.showerror("Ошибка ввода", str(e))
         return
     
+    clear_rec_cache()
     output_text.delete(1.0, tk.END)
     
-    header = (f"{'n':<3} | {'Итерационное':<22} | {'Рекурсия':<32} | "
-             f"{'Время итерации (мс)':<19} | {'Время рекурсии (мс)':<19}\n")
+    header = (f"{'n':<3} | {'Итерационное':<22} | {'Рекурсия':<22} | {'Рекурсия с кэшем':<22} | "
+             f"{'Итерация (мс)':<13} | {'Рекурсия (мс)':<13} | {'С кэшем (мс)':<13}\n")
     output_text.insert(tk.END, header)
-    output_text.insert(tk.END, "-"*120 + "\n")
+    output_text.insert(tk.END, "-"*140 + "\n")
     
     for n in range(n_max + 1):
+        # F_iter делит на целые факториалы и с n = 86 даёт OverflowError —
+        # это касается только его столбца, рекурсия с кэшем считается дальше
         try:
             start_iter = time.perf_counter()
-            fi = F_iter(n)
-            time_iter = (time.perf_counter() - start_iter) * 1000
-            
-            start_rec = time.perf_counter()
-            fr = F_rec(n)
-            time_rec = (time.perf_counter() - start_rec) * 1000 
-            
-            line = (f"{n:<3} | {fi:<22.14e} | {fr:<32.14e} | "
-                   f"{time_iter:<19.5f} | {time_rec:<19.5f}\n")
-            
-        except RecursionError:
-            line = (f"{n:<3} | {'-'*22} | {'RecursionError':<32} | "
-                   f"{'-'*19} | {'-'*19}\n")
-        except Exception as e:
-            line = (f"{n:<3} | {'Error':<22} | {str(e):<32} | "
-                   f"{'-'*19} | {'-'*19}\n")
+            fi = f"{F_iter(n):<22.14e}"
+            time_iter = f"{(time.perf_counter() - start_iter) * 1000:<13.5f}"
+        except OverflowError:
+            fi, time_iter = f"{'OverflowError':<22}", f"{'-'*13}"
+        
+        start_memo = time.perf_counter()
+        fm = F_rec_memo(n)
+        time_memo = (time.perf_counter() - start_memo) * 1000
+        
+        # Простая рекурсия экспоненциальна — считаем её только до REC_LIMIT
+        if n > REC_LIMIT:
+            rec, time_rec = f"{'-'*22}", f"{'-'*13}"
+        else:
+            try:
+                start_rec = time.perf_counter()
+                rec = f"{F_rec(n):<22.14e}"
+                time_rec = f"{(time.perf_counter() - start_rec) * 1000:<13.5f}"
+            except RecursionError:
+                rec, time_rec = f"{'RecursionError':<22}", f"{'-'*13}"
         
+        line = (f"{n:<3} | {fi} | {rec} | {fm:<22.14e} | "
+               f"{time_iter} | {time_rec} | {time_memo:<13.5f}\n")
         output_text.insert(tk.END, line)
-        output_text.see(tk.END)
+    output_text.insert(tk.END, rec_cache_report() + "\n")
+    output_text.see(tk.END)
 
 root = tk.Tk()
 root.title("Сравнение времени выполнения")
-root.geometry("900x600+400+200")
+root.geometry("1150x600+300+200")
 
 main_frame = ttk.Frame(root, padding="10")
 main_frame.pack(fill=tk.BOTH, expand=True)
@@ -91,6 +186,10 @@ control_frame.pack(fill=tk.X, pady=5)
 ttk.Label(control_frame, text="Максимальное n:", foreground="#01579B").pack(side=tk.LEFT)
 max_n_entry = ttk.Entry(control_frame, width=10)
 max_n_entry.pack(side=tk.LEFT, padx=5)
+ttk.Label(control_frame, text="Размер кэша:", foreground="#01579B").pack(side=tk.LEFT, padx=(10, 0))
+cache_entry = ttk.Entry(control_frame, width=10)
+cache_entry.insert(0, str(REC_CACHE_SIZE))
+cache_entry.pack(side=tk.LEFT, padx=5)
 ttk.Button(control_frame, text="Сравнить", command=compare_performance).pack(side=tk.LEFT)
 
 output_frame = ttk.Frame(main_frame)
@@ -99,7 +198,7 @@ output_frame.pack(fill=tk.BOTH, expand=True)
 output_text = scrolledtext.ScrolledText(
     output_frame,
     wrap=tk.WORD,
-    width=100,
+    width=140,
     height=25,
     font=('Consolas', 10)
 )
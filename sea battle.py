@@ -1,6 +1,13 @@
 import tkinter as tk
 import tkinter.messagebox as messagebox
 import random
+import os
+import sys
+import json
+import multiprocessing
+import time
+import argparse
+from array import array
 
 GRID_SIZE = 10
 CELL_PX = 36
@@ -12,73 +19,170 @@ COLORS = {
 SHIP_LENGTHS = [4, 3, 3, 2, 2, 2, 1, 1, 1, 1]
 CELL_EMPTY, CELL_SHIP, CELL_HIT, CELL_MISS = 0, 1, 2, 3
 
-def make_board():
-    return {
-        "grid": [[CELL_EMPTY]*GRID_SIZE for _ in range(GRID_SIZE)],
-        "ships": [],
-        "attacks": set()
-    }
+class Ship:
+    __slots__ = ("cells", "hits")
+
+    def __init__(self, cells):
+        self.cells = cells
+        self.hits = 0
+
+    @property
+    def sunk(self):
+        return self.hits == len(self.cells)
+
+class Board:
+    # Поле — плоский bytearray состояний клеток, ship_at хранит номер
+    # корабля + 1 для каждой клетки (0 — воды), поэтому попадание и
+    # потопление определяются без перебора кораблей.
+    __slots__ = ("size", "grid", "ship_at", "ships", "attacked", "alive", "dirty")
+
+    def __init__(self, size=GRID_SIZE):
+        self.size = size
+        self.reset()
+
+    def reset(self):
+        size = self.size
+        self.grid = bytearray(size * size)
+        self.ship_at = array("H", bytes(2 * size * size))
+        self.ships = []
+        self.attacked = bytearray(size * size)
+        self.alive = 0
+        self.dirty = set(range(size * size))
+
+def make_board(size=GRID_SIZE):
+    return Board(size)
 
-def neighbours(r, c):
+def neighbours(r, c, size=GRID_SIZE):
     for dr in (-1, 0, 1):
         for dc in (-1, 0, 1):
             if dr == 0 and dc == 0: continue
             nr, nc = r+dr, c+dc
-            if 0 <= nr < GRID_SIZE and 0 <= nc < GRID_SIZE:
+            if 0 <= nr < size and 0 <= nc < size:
                 yield nr, nc
 
 def can_place(board, r, c, length, horizontal):
+    size = board.size
     coords = [ (r, c+i) if horizontal else (r+i, c) for i in range(length) ]
     for rr, cc in coords:
-        if not (0 <= rr < GRID_SIZE and 0 <= cc < GRID_SIZE): return False
-        if board["grid"][rr][cc] != CELL_EMPTY: return False
-        for nr, nc in neighbours(rr, cc):
-            if board["grid"][nr][nc] == CELL_SHIP: return False
+        if not (0 <= rr < size and 0 <= cc < size): return False
+        if board.grid[rr*size+cc] != CELL_EMPTY: return False
+        for nr, nc in neighbours(rr, cc, size):
+            if board.grid[nr*size+nc] == CELL_SHIP: return False
     return True
 
 def place_ship(board, r, c, length, horizontal):
     if not can_place(board, r, c, length, horizontal): return False
-    coords = set((r, c+i) if horizontal else (r+i, c) for i in range(length))
-    board["ships"].append({"cells": coords, "hits": set()})
-    for rr, cc in coords: board["grid"][rr][cc] = CELL_SHIP
+    add_ship(board, r, c, length, horizontal)
     return True
 
-def auto_place(board, lengths):
-    board["grid"] = [[CELL_EMPTY]*GRID_SIZE for _ in range(GRID_SIZE)]
-    board["ships"] = []
-    board["attacks"] = set()
-    for length in lengths:
-        for _ in range(1000):
-            r, c = random.randint(0, GRID_SIZE-1), random.randint(0, GRID_SIZE-1)
-            horiz = random.choice([True, False])
-            if place_ship(board, r, c, length, horiz): break
+def add_ship(board, r, c, length, horizontal):
+    size = board.size
+    cells = tuple((r*size + c+i) if horizontal else ((r+i)*size + c) for i in range(length))
+    board.ships.append(Ship(cells))
+    board.alive += 1
+    ship_id = len(board.ships)
+    for idx in cells:
+        board.grid[idx] = CELL_SHIP
+        board.ship_at[idx] = ship_id
+    board.dirty.update(cells)
+
+# Авторасстановка: для каждой длины заранее известен список всех позиций
+# корабля на поле. Маска forbidden отмечает занятые клетки и их соседей
+# и обновляется после каждого корабля; позиция выбирается равномерно
+# среди допустимых. Тупик — перезапуск цикла, число попыток ограничено.
+
+_placements = {}
+
+def ship_placements(size, length):
+    key = (size, length)
+    if key not in _placements:
+        result = [(r, c, True) for r in range(size) for c in range(size - length + 1)]
+        if length > 1:
+            result += [(r, c, False) for r in range(size - length + 1) for c in range(size)]
+        _placements[key] = result
+    return _placements[key]
+
+def placement_free(forbidden, size, r, c, length, horizontal):
+    start = r*size + c
+    if horizontal:
+        return 1 not in forbidden[start:start + length]
+    return 1 not in forbidden[start:start + length*size:size]
+
+def mark_forbidden(forbidden, size, r, c, length, horizontal):
+    rows = range(max(0, r-1), min(size, r + (1 if horizontal else length) + 1))
+    c1 = max(0, c-1)
+    c2 = min(size, c + (length if horizontal else 1) + 1)
+    for rr in rows:
+        forbidden[rr*size + c1:rr*size + c2] = b"\x01" * (c2 - c1)
+
+def auto_place(board, lengths, rng=random, max_restarts=1000, samples=32):
+    size = board.size
+    order = sorted(lengths, reverse=True)
+    if order and not ship_placements(size, order[0]):
+        raise ValueError(f"Не удалось расставить флот: корабль длины {order[0]} не помещается на поле {size}x{size}")
+    for _ in range(max_restarts):
+        board.reset()
+        forbidden = bytearray(size * size)
+        for length in order:
+            options = ship_placements(size, length)
+            for _ in range(samples):
+                r, c, horiz = rng.choice(options)
+                if placement_free(forbidden, size, r, c, length, horiz):
+                    break
+            else:
+                valid = [(r, c, horiz) for r, c, horiz in options
+                         if placement_free(forbidden, size, r, c, length, horiz)]
+                if not valid:
+                    break
+                r, c, horiz = rng.choice(valid)
+            add_ship(board, r, c, length, horiz)
+            mark_forbidden(forbidden, size, r, c, length, horiz)
         else:
-            return auto_place(board, lengths)
+            return True
+    raise ValueError("Не удалось расставить флот: слишком плотная расстановка")
+
+def benchmark_placement(size=GRID_SIZE, lengths=SHIP_LENGTHS, seconds=1.0):
+    board = make_board(size)
+    fleets = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        auto_place(board, lengths)
+        fleets += 1
+    elapsed = time.perf_counter() - start
+    print(f"Поле {size}x{size}, кораблей {len(lengths)}: "
+          f"{fleets / elapsed:.0f} флотов/с, {fleets * len(lengths) / elapsed:.0f} кораблей/с")
 
 def receive_shot(board, r, c):
-    if (r, c) in board["attacks"]: return None
-    board["attacks"].add((r, c))
-    if board["grid"][r][c] == CELL_SHIP:
-        board["grid"][r][c] = CELL_HIT
-        for ship in board["ships"]:
-            if (r, c) in ship["cells"]:
-                ship["hits"].add((r, c))
-                if len(ship["hits"]) == len(ship["cells"]):
-                    mark_around_sunk(board, ship)
-                    return "sunk"
-                return "hit"
-    board["grid"][r][c] = CELL_MISS
+    idx = r*board.size + c
+    if board.attacked[idx]: return None
+    board.attacked[idx] = 1
+    board.dirty.add(idx)
+    ship_id = board.ship_at[idx]
+    if ship_id:
+        board.grid[idx] = CELL_HIT
+        ship = board.ships[ship_id - 1]
+        ship.hits += 1
+        if ship.sunk:
+            board.alive -= 1
+            board.dirty.update(ship.cells)
+            mark_around_sunk(board, ship)
+            return "sunk"
+        return "hit"
+    board.grid[idx] = CELL_MISS
     return "miss"
 
 def mark_around_sunk(board, ship):
-    for r, c in ship["cells"]:
-        for nr in range(max(0, r-1), min(GRID_SIZE, r+2)):
-            for nc in range(max(0, c-1), min(GRID_SIZE, c+2)):
-                if board["grid"][nr][nc] == CELL_EMPTY:
-                    board["grid"][nr][nc] = CELL_MISS
+    size = board.size
+    for idx in ship.cells:
+        r, c = divmod(idx, size)
+        for nr in range(max(0, r-1), min(size, r+2)):
+            for nc in range(max(0, c-1), min(size, c+2)):
+                if board.grid[nr*size+nc] == CELL_EMPTY:
+                    board.grid[nr*size+nc] = CELL_MISS
+                    board.dirty.add(nr*size+nc)
 
 def all_sunk(board):
-    return all(len(ship["hits"]) == len(ship["cells"]) for ship in board["ships"])
+    return board.alive == 0
 
 def bot_reset(state):
     state["available"] = [(r,c) for r in range(GRID_SIZE) for c in range(GRID_SIZE)]
@@ -102,6 +206,266 @@ def bot_feedback(state, coord, result):
     elif result == "sunk":
         state["hit_stack"] = []
 
+# Бот по карте плотности: для каждой оставшейся длины корабля хранится,
+# сколько допустимых позиций корабля накрывает каждую клетку. Промах или
+# клетка рядом с потопленным кораблём запрещают все позиции через неё,
+# и счётчики уменьшаются только для этих позиций.
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_placement_cells = {}
+
+def placement_cells(size, length):
+    key = (size, length)
+    if key not in _placement_cells:
+        cells = [tuple((r*size + c+i) if horiz else ((r+i)*size + c) for i in range(length))
+                 for r, c, horiz in ship_placements(size, length)]
+        covering = [[] for _ in range(size * size)]
+        for pid, ship_cells in enumerate(cells):
+            for idx in ship_cells:
+                covering[idx].append(pid)
+        _placement_cells[key] = (cells, covering)
+    return _placement_cells[key]
+
+def density_reset(state, size=GRID_SIZE, lengths=SHIP_LENGTHS):
+    state["size"] = size
+    state["remaining"] = {length: lengths.count(length) for length in set(lengths)}
+    state["shot"] = bytearray(size * size)
+    state["blocked"] = bytearray(size * size)
+    state["hits"] = set()
+    state["valid"] = {}
+    state["counts"] = {}
+    for length in state["remaining"]:
+        cells, covering = placement_cells(size, length)
+        state["valid"][length] = bytearray(b"\x01") * len(cells)
+        state["counts"][length] = array("i", [len(pids) for pids in covering])
+
+def _density_block(state, idx):
+    if state["blocked"][idx]:
+        return
+    state["blocked"][idx] = 1
+    for length, valid in state["valid"].items():
+        cells, covering = placement_cells(state["size"], length)
+        counts = state["counts"][length]
+        for pid in covering[idx]:
+            if valid[pid]:
+                valid[pid] = 0
+                for c in cells[pid]:
+                    counts[c] -= 1
+
+def _density_map(state):
+    size = state["size"]
+    if np is not None:
+        density = np.zeros(size * size, dtype=np.int64)
+        for length, left in state["remaining"].items():
+            if left:
+                density += left * np.frombuffer(state["counts"][length], dtype=np.int32)
+        density[np.frombuffer(state["shot"], dtype=np.uint8) == 1] = -1
+        return density.tolist()
+    density = [0] * (size * size)
+    for length, left in state["remaining"].items():
+        if left:
+            for idx, count in enumerate(state["counts"][length]):
+                density[idx] += left * count
+    for idx in range(size * size):
+        if state["shot"][idx]:
+            density[idx] = -1
+    return density
+
+def _target_map(state):
+    size = state["size"]
+    density = [0] * (size * size)
+    hits = state["hits"]
+    for length, left in state["remaining"].items():
+        if not left or length < 2:
+            continue
+        cells, covering = placement_cells(size, length)
+        valid = state["valid"][length]
+        seen = set()
+        for h in hits:
+            for pid in covering[h]:
+                if valid[pid] and pid not in seen:
+                    seen.add(pid)
+                    weight = left * sum(1 for c in cells[pid] if c in hits) ** 2
+                    for c in cells[pid]:
+                        if not state["shot"][c]:
+                            density[c] += weight
+    return density
+
+def density_next_shot(state):
+    density = _target_map(state) if state["hits"] else _density_map(state)
+    best = max(density)
+    if best <= 0:
+        free = [idx for idx in range(len(density)) if not state["shot"][idx]]
+        if not free:
+            return None
+        return divmod(random.choice(free), state["size"])
+    candidates = [idx for idx, value in enumerate(density) if value == best]
+    return divmod(random.choice(candidates), state["size"])
+
+def density_feedback(state, coord, result):
+    size = state["size"]
+    r, c = coord
+    idx = r*size + c
+    state["shot"][idx] = 1
+    if result == "miss":
+        _density_block(state, idx)
+    elif result == "hit":
+        state["hits"].add(idx)
+        for dr, dc in ((-1, -1), (-1, 1), (1, -1), (1, 1)):
+            nr, nc = r+dr, c+dc
+            if 0 <= nr < size and 0 <= nc < size:
+                _density_block(state, nr*size + nc)
+    elif result == "sunk":
+        ship = {idx}
+        stack = [idx]
+        while stack:
+            cr, cc = divmod(stack.pop(), size)
+            for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                nr, nc = cr+dr, cc+dc
+                n = nr*size + nc
+                if 0 <= nr < size and 0 <= nc < size and n in state["hits"] and n not in ship:
+                    ship.add(n)
+                    stack.append(n)
+        state["hits"] -= ship
+        length = len(ship)
+        if state["remaining"].get(length):
+            state["remaining"][length] -= 1
+        for s in ship:
+            sr, sc = divmod(s, size)
+            _density_block(state, s)
+            for nr, nc in neighbours(sr, sc, size):
+                _density_block(state, nr*size + nc)
+
+BOTS = {
+    "random": (bot_reset, bot_next_shot, bot_feedback),
+    "density": (density_reset, density_next_shot, density_feedback)
+}
+BOT_STRATEGY = "density"
+
+def play_solo(bot, lengths=SHIP_LENGTHS):
+    reset, next_shot, feedback = BOTS[bot]
+    board = make_board()
+    auto_place(board, lengths)
+    state = {}
+    reset(state)
+    shots = 0
+    while not all_sunk(board):
+        shot = next_shot(state)
+        if shot is None:
+            break
+        result = receive_shot(board, *shot)
+        if result is None:
+            continue
+        shots += 1
+        feedback(state, shot, result)
+    return shots
+
+def benchmark_bots(games=100_000, seed=0):
+    print(f"{'Бот':<8} | {'Партий':>7} | {'Среднее':>8} | {'Мин':>4} | {'Макс':>4} | {'Время, с':>8}")
+    print("-" * 54)
+    for bot in BOTS:
+        random.seed(seed)
+        start = time.perf_counter()
+        shots = [play_solo(bot) for _ in range(games)]
+        elapsed = time.perf_counter() - start
+        print(f"{bot:<8} | {games:>7} | {sum(shots) / games:>8.2f} | "
+              f"{min(shots):>4} | {max(shots):>4} | {elapsed:>8.1f}")
+
+# Матчи бот против бота без интерфейса: ходы чередуются как в GUI, при
+# попадании стреляющий ходит ещё раз. Партии делятся на пачки, каждая
+# пачка играется в своём процессе со своим зерном random.
+
+def play_match(bot_a, bot_b, a_first=True, lengths=SHIP_LENGTHS):
+    sides = {}
+    for name, bot in (("a", bot_a), ("b", bot_b)):
+        board = make_board()
+        auto_place(board, lengths)
+        state = {}
+        BOTS[bot][0](state)
+        sides[name] = {"bot": bot, "board": board, "state": state, "shots": 0}
+    turn, other = ("a", "b") if a_first else ("b", "a")
+    while True:
+        side, target = sides[turn], sides[other]["board"]
+        _, next_shot, feedback = BOTS[side["bot"]]
+        shot = next_shot(side["state"])
+        if shot is None:
+            return other, sides
+        result = receive_shot(target, *shot)
+        if result is None:
+            continue
+        side["shots"] += 1
+        feedback(side["state"], shot, result)
+        if all_sunk(target):
+            return turn, sides
+        if result == "miss":
+            turn, other = other, turn
+
+def _match_shard(args):
+    bot_a, bot_b, games, seed, first_game = args
+    random.seed(seed)
+    wins = {"a": 0, "b": 0}
+    shots = {"a": {}, "b": {}}
+    for n in range(games):
+        winner, sides = play_match(bot_a, bot_b, a_first=(first_game + n) % 2 == 0)
+        wins[winner] += 1
+        count = sides[winner]["shots"]
+        shots[winner][count] = shots[winner].get(count, 0) + 1
+    return wins, shots
+
+def run_matches(bot_a, bot_b, games, workers=1, seed=0, shard_size=1000):
+    shards = [(bot_a, bot_b, min(shard_size, games - start), seed * 1_000_003 + n, start)
+              for n, start in enumerate(range(0, games, shard_size))]
+    wins = {"a": 0, "b": 0}
+    shots = {"a": {}, "b": {}}
+    if workers <= 1:
+        results = [_match_shard(shard) for shard in shards]
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            results = pool.map(_match_shard, shards)
+    for shard_wins, shard_shots in results:
+        for side in ("a", "b"):
+            wins[side] += shard_wins[side]
+            for count, n in shard_shots[side].items():
+                shots[side][count] = shots[side].get(count, 0) + n
+    return wins, shots
+
+def match_main(argv):
+    parser = argparse.ArgumentParser(description="Матчи ботов морского боя")
+    parser.add_argument("--a", default="density", choices=BOTS)
+    parser.add_argument("--b", default="random", choices=BOTS)
+    parser.add_argument("--games", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--shard-size", type=int, default=1000)
+    parser.add_argument("--out", default="match_results.json")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    wins, shots = run_matches(args.a, args.b, args.games, args.workers,
+                              args.seed, args.shard_size)
+    elapsed = time.perf_counter() - start
+
+    report = {
+        "bots": {"a": args.a, "b": args.b},
+        "games": args.games,
+        "workers": args.workers,
+        "seed": args.seed,
+        "shard_size": args.shard_size,
+        "wins": wins,
+        "shots_to_win": {side: dict(sorted(hist.items())) for side, hist in shots.items()},
+        "elapsed": elapsed,
+        "games_per_sec": args.games / elapsed if elapsed else 0.0
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"{args.a} против {args.b}: {wins['a']} : {wins['b']} "
+          f"за {elapsed:.1f} с ({report['games_per_sec']:.0f} партий/с) -> {args.out}")
+
 def make_controller():
     return {
         "player_board": make_board(),
@@ -122,6 +486,8 @@ class GUI:
         self.canvas_size = GRID_SIZE * self.cell
         self.dragging = False
         self.preview_items = []
+        self.preview_key = None
+        self.views = {}
         self.setup_ui()
         self.redraw_all()
 
@@ -201,26 +567,34 @@ class GUI:
             self.clear_preview()
 
     def clear_preview(self):
+        if self.preview_key is None: return
         for item in self.preview_items:
-            self.player_canvas.delete(item)
-        self.preview_items = []
+            self.player_canvas.itemconfig(item, state="hidden")
+        self.preview_key = None
 
     def update_preview_anchor(self, r, c):
-        self.clear_preview()
+        # Подсказка — постоянные прямоугольники, которые только двигаются;
+        # при движении мыши внутри той же клетки ничего не перерисовывается
         idx = self.controller["placement_index"]
+        horiz = self.controller["orientation"]
+        key = (r, c, idx, horiz)
+        if key == self.preview_key: return
+        self.clear_preview()
         if idx >= len(SHIP_LENGTHS): return
+        self.preview_key = key
         length = SHIP_LENGTHS[idx]
-        horiz = self.controller["orientation"]
         coords = [(r, c+i) if horiz else (r+i, c) for i in range(length)]
+        coords = [(rr, cc) for rr, cc in coords if 0 <= rr < GRID_SIZE and 0 <= cc < GRID_SIZE]
         valid = can_place(self.controller["player_board"], r, c, length, horiz)
         color = COLORS["hover_ok"] if valid else COLORS["hover_bad"]
-        for rr, cc in coords:
-            if 0 <= rr < GRID_SIZE and 0 <= cc < GRID_SIZE:
-                x1, y1 = cc*self.cell, rr*self.cell
-                x2, y2 = x1 + self.cell, y1 + self.cell
-                rect = self.player_canvas.create_rectangle(x1, y1, x2, y2,
-                                                         fill=color, outline=COLORS["grid_line"], stipple="gray50")
-                self.preview_items.append(rect)
+        while len(self.preview_items) < len(coords):
+            rect = self.player_canvas.create_rectangle(0, 0, 0, 0, outline=COLORS["grid_line"],
+                                                       stipple="gray50", state="hidden")
+            self.preview_items.append(rect)
+        for (rr, cc), item in zip(coords, self.preview_items):
+            x1, y1 = cc*self.cell, rr*self.cell
+            self.player_canvas.coords(item, x1, y1, x1 + self.cell, y1 + self.cell)
+            self.player_canvas.itemconfig(item, fill=color, state="normal")
 
     def player_place(self, r, c):
         idx = self.controller["placement_index"]
@@ -234,11 +608,11 @@ class GUI:
         return False
 
     def start_play(self):
-        if not self.controller["cpu_board"]["ships"]:
+        if not self.controller["cpu_board"].ships:
             auto_place(self.controller["cpu_board"], SHIP_LENGTHS)
         self.controller["stage"] = "playing"
         self.controller["player_turn"] = True
-        bot_reset(self.controller["ai"])
+        BOTS[BOT_STRATEGY][0](self.controller["ai"])
 
     def on_enemy_click(self, event):
         if self.controller["stage"] != "playing" or not self.controller["player_turn"]: return
@@ -261,15 +635,15 @@ class GUI:
     def computer_turn(self):
         if self.controller["stage"] != "playing" or self.controller["player_turn"]: return
         while True:
-            shot = bot_next_shot(self.controller["ai"])
+            shot = BOTS[BOT_STRATEGY][1](self.controller["ai"])
             if not shot:
                 self.controller["player_turn"] = True
                 return
             r, c = shot
-            if (r, c) not in self.controller["player_board"]["attacks"]:
+            if not self.controller["player_board"].attacked[r*GRID_SIZE + c]:
                 break
         result = receive_shot(self.controller["player_board"], r, c)
-        bot_feedback(self.controller["ai"], (r, c), result)
+        BOTS[BOT_STRATEGY][2](self.controller["ai"], (r, c), result)
         self.redraw_all()
         if all_sunk(self.controller["player_board"]):
             self.controller["stage"] = "ended"
@@ -283,37 +657,66 @@ class GUI:
     def redraw_all(self):
         self.draw_player_board()
         self.draw_enemy_board()
-        player_alive = sum(1 for s in self.controller["player_board"]["ships"] if len(s["hits"]) < len(s["cells"]))
-        enemy_alive = sum(1 for s in self.controller["cpu_board"]["ships"] if len(s["hits"]) < len(s["cells"]))
-        self.count_label.config(text=f"Ваши корабли: {player_alive}/10   |   Корабли противника: {enemy_alive}/10")
-
-    def draw_board(self, canvas, board, show_ships):
+        player_alive = self.controller["player_board"].alive
+        enemy_alive = self.controller["cpu_board"].alive
+        total = len(SHIP_LENGTHS)
+        self.count_label.config(text=f"Ваши корабли: {player_alive}/{total}   |   Корабли противника: {enemy_alive}/{total}")
+
+    def create_view(self, canvas, board):
+        # Клетки, крестики потопленных кораблей и сетка создаются один раз
+        # на поле; дальше draw_board меняет только изменившиеся клетки
         canvas.delete("all")
+        if canvas is self.player_canvas:
+            self.preview_items = []
+            self.preview_key = None
+        view = {"board": board, "rects": [], "crosses": [],
+                "fill": [None] * (GRID_SIZE * GRID_SIZE),
+                "sunk": [False] * (GRID_SIZE * GRID_SIZE)}
+        pad = int(self.cell * 0.18)
         for r in range(GRID_SIZE):
             for c in range(GRID_SIZE):
                 x1, y1 = c*self.cell, r*self.cell
                 x2, y2 = x1 + self.cell, y1 + self.cell
-                state = board["grid"][r][c]
-                if state == CELL_EMPTY:
-                    fill = COLORS["water"]
-                elif state == CELL_SHIP:
-                    fill = COLORS["ship"] if show_ships else COLORS["water"]
-                elif state == CELL_HIT:
-                    fill = COLORS["hit"]
-                else:
-                    fill = COLORS["miss"]
-                canvas.create_rectangle(x1, y1, x2, y2, fill=fill, outline=COLORS["grid_line"])
-        for ship in board["ships"]:
-            if len(ship["hits"]) == len(ship["cells"]):
-                for r, c in ship["cells"]:
-                    x1, y1 = c*self.cell, r*self.cell
-                    x2, y2 = x1 + self.cell, y1 + self.cell
-                    pad = int(self.cell * 0.18)
-                    canvas.create_line(x1+pad, y1+pad, x2-pad, y2-pad, fill="black", width=2)
-                    canvas.create_line(x1+pad, y2-pad, x2-pad, y1+pad, fill="black", width=2)
+                view["rects"].append(canvas.create_rectangle(
+                    x1, y1, x2, y2, fill=COLORS["water"], outline=COLORS["grid_line"]))
+        for r in range(GRID_SIZE):
+            for c in range(GRID_SIZE):
+                x1, y1 = c*self.cell, r*self.cell
+                x2, y2 = x1 + self.cell, y1 + self.cell
+                view["crosses"].append((
+                    canvas.create_line(x1+pad, y1+pad, x2-pad, y2-pad, fill="black", width=2, state="hidden"),
+                    canvas.create_line(x1+pad, y2-pad, x2-pad, y1+pad, fill="black", width=2, state="hidden")))
         for i in range(GRID_SIZE+1):
             canvas.create_line(0, i*self.cell, self.canvas_size, i*self.cell, fill=COLORS["grid_line"])
             canvas.create_line(i*self.cell, 0, i*self.cell, self.canvas_size, fill=COLORS["grid_line"])
+        board.dirty = set(range(GRID_SIZE * GRID_SIZE))
+        self.views[canvas] = view
+        return view
+
+    def draw_board(self, canvas, board, show_ships):
+        view = self.views.get(canvas)
+        if view is None or view["board"] is not board:
+            view = self.create_view(canvas, board)
+        for idx in board.dirty:
+            state = board.grid[idx]
+            if state == CELL_EMPTY:
+                fill = COLORS["water"]
+            elif state == CELL_SHIP:
+                fill = COLORS["ship"] if show_ships else COLORS["water"]
+            elif state == CELL_HIT:
+                fill = COLORS["hit"]
+            else:
+                fill = COLORS["miss"]
+            if fill != view["fill"][idx]:
+                canvas.itemconfig(view["rects"][idx], fill=fill)
+                view["fill"][idx] = fill
+            ship_id = board.ship_at[idx]
+            sunk = bool(ship_id) and board.ships[ship_id - 1].sunk
+            if sunk != view["sunk"][idx]:
+                for item in view["crosses"][idx]:
+                    canvas.itemconfig(item, state="normal" if sunk else "hidden")
+                view["sunk"][idx] = sunk
+        board.dirty.clear()
 
     def draw_player_board(self):
         self.draw_board(self.player_canvas, self.controller["player_board"], True)
@@ -334,5 +737,22 @@ def main():
     root.geometry(f"{width}x{height}+{x}+{y}")
     root.mainloop()
 
+def bench_main(argv):
+    parser = argparse.ArgumentParser(description="Скорость авторасстановки флота")
+    parser.add_argument("--size", type=int, default=GRID_SIZE)
+    parser.add_argument("--ships", default=",".join(map(str, SHIP_LENGTHS)),
+                        help="длины кораблей через запятую")
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args(argv)
+    lengths = [int(v) for v in args.ships.split(",")]
+    benchmark_placement(args.size, lengths, args.seconds)
+
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1 and sys.argv[1] == "bench-place":
+        bench_main(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == "match":
+        match_main(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == "bench-bots":
+        benchmark_bots(int(sys.argv[2]) if len(sys.argv) > 2 else 100_000)
+    else:
+        main()
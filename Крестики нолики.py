@@ -1,17 +1,448 @@
 import tkinter as tk
 from tkinter import messagebox
+import os
+import sys
+import time
+import zlib
+import struct
+import random
+import argparse
+import multiprocessing
+from collections import Counter
 
 Player = "X"
 Bot = "O"
 
+def minimax(board, depth, is_maximizing):
+    if check_winner_board(board, Bot):
+        return 10 - depth
+    if check_winner_board(board, Player):
+        return depth - 10
+    if is_draw_board(board):
+        return 0
+
+    if is_maximizing:
+        best_score = -float('inf')
+        for i in range(3):
+            for j in range(3):
+                if board[i][j] == "":
+                    board[i][j] = Bot
+                    score = minimax(board, depth + 1, False)
+                    board[i][j] = ""
+                    best_score = max(score, best_score)
+        return best_score
+    else:
+        best_score = float('inf')
+        for i in range(3):
+            for j in range(3):
+                if board[i][j] == "":
+                    board[i][j] = Player
+                    score = minimax(board, depth + 1, True)
+                    board[i][j] = ""
+                    best_score = min(score, best_score)
+        return best_score
+
+def check_winner_board(board, player):
+    for i in range(3):
+        if all(board[i][j] == player for j in range(3)):
+            return True
+    for j in range(3):
+        if all(board[i][j] == player for i in range(3)):
+            return True
+    if all(board[i][i] == player for i in range(3)):
+        return True
+    if all(board[i][2 - i] == player for i in range(3)):
+        return True
+    return False
+
+def is_draw_board(board):
+    return all(board[i][j] != "" for i in range(3) for j in range(3))
+
+# Решатель с таблицей транспозиций: позиция кодируется числом в троичной
+# системе, симметричные позиции (8 поворотов/отражений) сводятся к одному
+# ключу. Оценка +(1 + пустых клеток) за победу ходящего, 0 за ничью —
+# упорядочивает ходы так же, как 10 - depth в minimax.
+
+CELL_CODES = {"": 0, Player: 1, Bot: 2}
+POW3 = [3 ** k for k in range(9)]
+LINES = [
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),
+    (0, 4, 8), (2, 4, 6)
+]
+LINES_THROUGH = [[line for line in LINES if k in line] for k in range(9)]
+SYMMETRIES = [
+    [r * 3 + c for r in range(3) for c in range(3)],
+    [c * 3 + (2 - r) for r in range(3) for c in range(3)],
+    [(2 - r) * 3 + (2 - c) for r in range(3) for c in range(3)],
+    [(2 - c) * 3 + r for r in range(3) for c in range(3)],
+    [r * 3 + (2 - c) for r in range(3) for c in range(3)],
+    [c * 3 + r for r in range(3) for c in range(3)],
+    [(2 - r) * 3 + c for r in range(3) for c in range(3)],
+    [(2 - c) * 3 + (2 - r) for r in range(3) for c in range(3)]
+]
+EXACT, LOWER, UPPER = 0, 1, 2
+
+_solve_cache = {}
+_best_cache = {}
+
+def board_cells(board):
+    return [CELL_CODES[board[i][j]] for i in range(3) for j in range(3)]
+
+def canonical_key(cells, to_move):
+    return min(sum(cells[p[k]] * POW3[k] for k in range(9)) for p in SYMMETRIES) * 3 + to_move
+
+def wins_at(cells, k):
+    who = cells[k]
+    return any(cells[a] == who and cells[b] == who and cells[c] == who
+               for a, b, c in LINES_THROUGH[k])
+
+def move_score(cells, k, to_move, empties):
+    # Оценка хода k для ходящего: клетка k уже занята им
+    if wins_at(cells, k):
+        return empties
+    if empties == 1:
+        return 0
+    return -solve(cells, 3 - to_move, empties - 1)
+
+def solve(cells, to_move, empties, alpha=-100, beta=100):
+    key = canonical_key(cells, to_move)
+    entry = _solve_cache.get(key)
+    if entry is not None:
+        value, flag = entry
+        if flag == EXACT:
+            return value
+        if flag == LOWER and value >= beta:
+            return value
+        if flag == UPPER and value <= alpha:
+            return value
+
+    orig_alpha = alpha
+    best = -100
+    for k in range(9):
+        if cells[k]:
+            continue
+        cells[k] = to_move
+        score = move_score(cells, k, to_move, empties)
+        cells[k] = 0
+        if score > best:
+            best = score
+        if best > alpha:
+            alpha = best
+        if alpha >= beta:
+            break
+
+    if best <= orig_alpha:
+        _solve_cache[key] = (best, UPPER)
+    elif best >= beta:
+        _solve_cache[key] = (best, LOWER)
+    else:
+        _solve_cache[key] = (best, EXACT)
+    return best
+
+def best_cell(cells, to_move):
+    # Ключ включает ходящего: на одной доске лучший ход у X и O разный
+    key = sum(c * p for c, p in zip(cells, POW3)) * 3 + to_move
+    if key in _best_cache:
+        return _best_cache[key]
+    empties = cells.count(0)
+    best_score = -100
+    best = None
+    for k in range(9):
+        if cells[k]:
+            continue
+        cells[k] = to_move
+        score = move_score(cells, k, to_move, empties)
+        cells[k] = 0
+        if score > best_score:
+            best_score = score
+            best = k
+    _best_cache[key] = best
+    return best
+
+def best_move(board, player):
+    k = best_cell(board_cells(board), CELL_CODES[player])
+    return None if k is None else divmod(k, 3)
+
+# Дебютная книга: для всех достижимых позиций заранее записан лучший ход.
+# Файл — заголовок (сигнатура, версия, CRC32) и 3^9 байт: индекс — троичный
+# код доски, значение — номер клетки 0..8 или 255, если хода нет. CRC
+# считается вместе с правилами, поэтому книга от других правил отвергается.
+
+BOOK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ttt_book.bin")
+BOOK_MAGIC = b"TTTB"
+BOOK_VERSION = 1
+BOOK_HEADER = struct.Struct("<4sBI")
+NO_MOVE = 255
+
+_book = None
+_book_loaded = False
+book_load_ms = None
+
+def board_code(cells):
+    return sum(c * p for c, p in zip(cells, POW3))
+
+def book_checksum(table):
+    rules = repr((BOOK_VERSION, LINES, Player, Bot)).encode("utf-8")
+    return zlib.crc32(table, zlib.crc32(rules))
+
+def build_book(path=BOOK_FILE):
+    table = bytearray([NO_MOVE]) * (3 ** 9)
+    seen = set()
+    stack = [[0] * 9]
+    while stack:
+        cells = stack.pop()
+        code = board_code(cells)
+        if code in seen:
+            continue
+        seen.add(code)
+        if any(wins_at(cells, k) for k in range(9) if cells[k]) or 0 not in cells:
+            continue
+        to_move = 1 if cells.count(1) == cells.count(2) else 2
+        player = Player if to_move == 1 else Bot
+        board = [[["", Player, Bot][cells[i * 3 + j]] for j in range(3)] for i in range(3)]
+        i, j = best_move(board, player)
+        table[code] = i * 3 + j
+        for k in range(9):
+            if not cells[k]:
+                child = cells[:]
+                child[k] = to_move
+                stack.append(child)
+    with open(path, "wb") as f:
+        f.write(BOOK_HEADER.pack(BOOK_MAGIC, BOOK_VERSION, book_checksum(table)))
+        f.write(table)
+    return len(seen)
+
+def load_book(path=BOOK_FILE):
+    global book_load_ms
+    start = time.perf_counter()
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    header, table = data[:BOOK_HEADER.size], data[BOOK_HEADER.size:]
+    if len(header) < BOOK_HEADER.size or len(table) != 3 ** 9:
+        return None
+    magic, version, checksum = BOOK_HEADER.unpack(header)
+    if magic != BOOK_MAGIC or version != BOOK_VERSION or checksum != book_checksum(table):
+        return None
+    book_load_ms = (time.perf_counter() - start) * 1000
+    return table
+
+def book_cell(cells, to_move):
+    global _book, _book_loaded
+    if not _book_loaded:
+        _book = load_book()
+        _book_loaded = True
+    if _book is not None:
+        k = _book[board_code(cells)]
+        if k != NO_MOVE:
+            return k
+    return best_cell(cells, to_move)
+
+def book_move(board, player):
+    k = book_cell(board_cells(board), CELL_CODES[player])
+    return None if k is None else divmod(k, 3)
+
+# Движок для поля N×N с победой K в ряд, не зависящий от Tk. Победа
+# проверяется только по линиям через последний ход, оценка позиции —
+# сумма по всем окнам длины K, обновляется при каждом ходе и откате.
+
+BOARD_SIZE = 3
+WIN_LENGTH = 3
+BOT_TIME_LIMIT = 1.0
+ENGINE_WIN = 10 ** 9
+
+class _SearchTimeout(Exception):
+    pass
+
+class Engine:
+    def __init__(self, size=BOARD_SIZE, k=WIN_LENGTH):
+        self.size = size
+        self.k = k
+        self.weights = [0] + [10 ** c for c in range(1, k)]
+        self.windows = []
+        for r in range(size):
+            for c in range(size):
+                for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    er, ec = r + dr * (k - 1), c + dc * (k - 1)
+                    if 0 <= er < size and 0 <= ec < size:
+                        self.windows.append(
+                            [(r + dr * i) * size + c + dc * i for i in range(k)]
+                        )
+        self.windows_through = [[] for _ in range(size * size)]
+        for w, window in enumerate(self.windows):
+            for idx in window:
+                self.windows_through[idx].append(w)
+        self.neighbours = [
+            [nr * size + nc
+             for nr in range(max(0, r - 1), min(size, r + 2))
+             for nc in range(max(0, c - 1), min(size, c + 2))
+             if (nr, nc) != (r, c)]
+            for r in range(size) for c in range(size)
+        ]
+        self.reset()
+
+    def reset(self):
+        self.cells = [0] * (self.size * self.size)
+        self.counts = [[0, 0, 0] for _ in self.windows]
+        self.score = 0
+        self.moves = []
+        self.nodes = 0
+        self.deadline = None
+
+    def _window_value(self, counts):
+        if counts[1] and not counts[2]:
+            return self.weights[min(counts[1], self.k - 1)]
+        if counts[2] and not counts[1]:
+            return -self.weights[min(counts[2], self.k - 1)]
+        return 0
+
+    def play(self, idx, who):
+        self.cells[idx] = who
+        self.moves.append(idx)
+        for w in self.windows_through[idx]:
+            counts = self.counts[w]
+            self.score -= self._window_value(counts)
+            counts[who] += 1
+            self.score += self._window_value(counts)
+
+    def undo(self):
+        idx = self.moves.pop()
+        who = self.cells[idx]
+        self.cells[idx] = 0
+        for w in self.windows_through[idx]:
+            counts = self.counts[w]
+            self.score -= self._window_value(counts)
+            counts[who] -= 1
+            self.score += self._window_value(counts)
+
+    def wins_at(self, idx):
+        who = self.cells[idx]
+        if not who:
+            return False
+        r, c = divmod(idx, self.size)
+        for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            cnt = 1
+            for s in (1, -1):
+                nr, nc = r + dr * s, c + dc * s
+                while (0 <= nr < self.size and 0 <= nc < self.size
+                       and self.cells[nr * self.size + nc] == who):
+                    cnt += 1
+                    nr += dr * s
+                    nc += dc * s
+            if cnt >= self.k:
+                return True
+        return False
+
+    def last_move_wins(self):
+        return bool(self.moves) and self.wins_at(self.moves[-1])
+
+    def is_full(self):
+        return len(self.moves) == len(self.cells)
+
+    def evaluate(self, who):
+        return self.score if who == 1 else -self.score
+
+    def ordered_moves(self, who):
+        if not self.moves:
+            return [(self.size // 2) * self.size + self.size // 2]
+        cells = self.cells
+        candidates = {n for idx in self.moves for n in self.neighbours[idx]
+                      if not cells[n]}
+        weights = self.weights
+        k = self.k
+
+        def priority(idx):
+            total = 0
+            for w in self.windows_through[idx]:
+                counts = self.counts[w]
+                if not counts[3 - who]:
+                    total += weights[min(counts[who], k - 1)] * 2
+                if not counts[who]:
+                    total += weights[min(counts[3 - who], k - 1)]
+            return total
+
+        return sorted(candidates, key=priority, reverse=True)
+
+    def _negamax(self, who, depth, alpha, beta):
+        self.nodes += 1
+        if (self.deadline is not None and self.nodes & 255 == 0
+                and time.perf_counter() > self.deadline):
+            raise _SearchTimeout()
+        if depth == 0:
+            return self.evaluate(who)
+
+        best = -ENGINE_WIN * 2
+        for idx in self.ordered_moves(who):
+            self.play(idx, who)
+            if self.wins_at(idx):
+                score = ENGINE_WIN + depth
+            elif self.is_full():
+                score = 0
+            else:
+                score = -self._negamax(3 - who, depth - 1, -beta, -alpha)
+            self.undo()
+            if score > best:
+                best = score
+            if best > alpha:
+                alpha = best
+            if alpha >= beta:
+                break
+        return best
+
+    def best_move(self, who, max_depth=None, time_limit=BOT_TIME_LIMIT):
+        empties = len(self.cells) - len(self.moves)
+        if not empties:
+            return None
+        max_depth = min(max_depth or empties, empties)
+        moves = self.ordered_moves(who)
+        if len(moves) == 1:
+            return moves[0]
+        self.nodes = 0
+        self.deadline = time.perf_counter() + time_limit if time_limit else None
+        best = moves[0]
+        played = len(self.moves)
+        try:
+            for depth in range(1, max_depth + 1):
+                best_score = -ENGINE_WIN * 2
+                depth_best = moves[0]
+                for idx in moves:
+                    self.play(idx, who)
+                    if self.wins_at(idx):
+                        score = ENGINE_WIN + depth
+                    elif self.is_full():
+                        score = 0
+                    else:
+                        score = -self._negamax(3 - who, depth - 1,
+                                               -ENGINE_WIN * 2, -best_score)
+                    self.undo()
+                    if score > best_score:
+                        best_score = score
+                        depth_best = idx
+                best = depth_best
+                moves.remove(best)
+                moves.insert(0, best)
+                if best_score >= ENGINE_WIN:
+                    break
+        except _SearchTimeout:
+            while len(self.moves) > played:
+                self.undo()
+        finally:
+            self.deadline = None
+        return best
+
 class TicTacToe:
-    def __init__(self, root):
+    def __init__(self, root, size=BOARD_SIZE, k=WIN_LENGTH):
         self.root = root
         self.root.title("Крестики-нолики")
         self.root.resizable(False, False)
 
-        self.buttons = [[None for _ in range(3)] for _ in range(3)]
-        self.board = [["" for _ in range(3)] for _ in range(3)]
+        self.size = size
+        self.engine = Engine(size, k)
+        self.buttons = [[None for _ in range(size)] for _ in range(size)]
+        self.board = [["" for _ in range(size)] for _ in range(size)]
 
         self.create_buttons()
         self.create_reset_button()
@@ -19,14 +450,15 @@ class TicTacToe:
         self.player_turn = True
 
     def create_buttons(self):
-        for i in range(3):
-            for j in range(3):
+        font_size = max(12, 120 // self.size)
+        for i in range(self.size):
+            for j in range(self.size):
                 btn = tk.Button(
                     self.root,
                     text="",
-                    font=("Arial", 40),
-                    width=5,
-                    height=2,
+                    font=("Arial", font_size),
+                    width=5 if self.size == 3 else 2,
+                    height=2 if self.size == 3 else 1,
                     command=lambda x=i, y=j: self.player_move(x, y),
                 )
                 btn.grid(row=i, column=j, padx=1, pady=1)
@@ -36,7 +468,8 @@ class TicTacToe:
         reset_btn = tk.Button(
             self.root, text="Новая игра", font=("Arial", 14), command=self.reset
         )
-        reset_btn.grid(row=3, column=0, columnspan=3, sticky="we", padx=2, pady=2)
+        reset_btn.grid(row=self.size, column=0, columnspan=self.size,
+                       sticky="we", padx=2, pady=2)
 
     def player_move(self, x, y):
         if not self.player_turn:
@@ -56,22 +489,13 @@ class TicTacToe:
                 self.root.after(250, self.bot_move)
 
     def bot_move(self):
-        best_score = -float('inf')
-        best_move = None
-        
-        for i in range(3):
-            for j in range(3):
-                if self.board[i][j] == "":
-                    self.board[i][j] = Bot
-                    score = self.minimax(self.board, 0, False)
-                    self.board[i][j] = ""
-                    
-                    if score > best_score:
-                        best_score = score
-                        best_move = (i, j)
-        
-        if best_move:
-            x, y = best_move
+        if self.size == 3 and self.engine.k == 3:
+            move = book_move(self.board, Bot)
+        else:
+            move = divmod(self.engine.best_move(CELL_CODES[Bot]), self.size)
+
+        if move:
+            x, y = move
             self.make_move(x, y, Bot)
             if self.check_winner(Bot):
                 messagebox.showinfo("Игра окончена", "Бот выиграл!")
@@ -85,71 +509,163 @@ class TicTacToe:
         self.player_turn = True
 
     def minimax(self, board, depth, is_maximizing):
-        if self.check_winner_board(board, Bot):
-            return 10 - depth
-        if self.check_winner_board(board, Player):
-            return depth - 10
-        if self.is_draw_board(board):
-            return 0
-
-        if is_maximizing:
-            best_score = -float('inf')
-            for i in range(3):
-                for j in range(3):
-                    if board[i][j] == "":
-                        board[i][j] = Bot
-                        score = self.minimax(board, depth + 1, False)
-                        board[i][j] = ""
-                        best_score = max(score, best_score)
-            return best_score
-        else:
-            best_score = float('inf')
-            for i in range(3):
-                for j in range(3):
-                    if board[i][j] == "":
-                        board[i][j] = Player
-                        score = self.minimax(board, depth + 1, True)
-                        board[i][j] = ""
-                        best_score = min(score, best_score)
-            return best_score
+        return minimax(board, depth, is_maximizing)
 
     def check_winner_board(self, board, player):
-        for i in range(3):
-            if all(board[i][j] == player for j in range(3)):
-                return True
-        for j in range(3):
-            if all(board[i][j] == player for i in range(3)):
-                return True
-        if all(board[i][i] == player for i in range(3)):
-            return True
-        if all(board[i][2 - i] == player for i in range(3)):
-            return True
-        return False
+        return check_winner_board(board, player)
 
     def make_move(self, x, y, player):
         self.board[x][y] = player
+        self.engine.play(x * self.size + y, CELL_CODES[player])
         self.buttons[x][y].config(
             text=player, state="disabled", disabledforeground="navy"
         )
 
     def check_winner(self, player):
-        return self.check_winner_board(self.board, player)
+        engine = self.engine
+        return (engine.last_move_wins()
+                and engine.cells[engine.moves[-1]] == CELL_CODES[player])
 
     def is_draw(self):
-        return all(self.board[i][j] != "" for i in range(3) for j in range(3))
+        return self.engine.is_full()
 
     def is_draw_board(self, board):
-        return all(board[i][j] != "" for i in range(3) for j in range(3))
+        return is_draw_board(board)
 
     def reset(self):
-        self.board = [["" for _ in range(3)] for _ in range(3)]
-        for i in range(3):
-            for j in range(3):
+        self.board = [["" for _ in range(self.size)] for _ in range(self.size)]
+        self.engine.reset()
+        for i in range(self.size):
+            for j in range(self.size):
                 self.buttons[i][j].config(text="", state="normal")
         self.player_turn = True
 
 
+# Турнир ботов без интерфейса: стратегии играют друг с другом на движке,
+# партии делятся между процессами, у каждой пачки свой зерно генератора.
+
+def _engine_board(engine):
+    size = engine.size
+    return [[["", Player, Bot][engine.cells[i * size + j]] for j in range(size)]
+            for i in range(size)]
+
+def random_strategy(engine, who, rng):
+    return rng.choice([idx for idx, cell in enumerate(engine.cells) if not cell])
+
+def minimax_strategy(engine, who, rng):
+    board = _engine_board(engine)
+    mark = Player if who == 1 else Bot
+    best_score = None
+    best = None
+    for i in range(3):
+        for j in range(3):
+            if board[i][j] == "":
+                board[i][j] = mark
+                score = minimax(board, 0, who == 1)
+                board[i][j] = ""
+                if who == 1:
+                    score = -score
+                if best_score is None or score > best_score:
+                    best_score = score
+                    best = i * 3 + j
+    return best
+
+def solver_strategy(engine, who, rng):
+    return best_cell(engine.cells[:], who)
+
+def book_strategy(engine, who, rng):
+    return book_cell(engine.cells[:], who)
+
+def engine_strategy(engine, who, rng):
+    return engine.best_move(who, max_depth=4, time_limit=None)
+
+STRATEGIES = {
+    "random": random_strategy,
+    "minimax": minimax_strategy,
+    "solver": solver_strategy,
+    "book": book_strategy,
+    "engine": engine_strategy
+}
+
+def play_match(engine, x_strategy, o_strategy, rng):
+    engine.reset()
+    strategies = {1: x_strategy, 2: o_strategy}
+    who = 1
+    while True:
+        idx = strategies[who](engine, who, rng)
+        engine.play(idx, who)
+        if engine.wins_at(idx):
+            return Player if who == 1 else Bot
+        if engine.is_full():
+            return "draw"
+        who = 3 - who
+
+def _tournament_shard(args):
+    x_name, o_name, games, size, k, seed = args
+    rng = random.Random(seed)
+    engine = Engine(size, k)
+    x_strategy, o_strategy = STRATEGIES[x_name], STRATEGIES[o_name]
+    results = Counter()
+    for _ in range(games):
+        results[play_match(engine, x_strategy, o_strategy, rng)] += 1
+    return results
+
+def run_tournament(x_name, o_name, games, workers=1, size=BOARD_SIZE,
+                   k=WIN_LENGTH, seed=0, shard_size=10_000):
+    shards = []
+    for n, start in enumerate(range(0, games, shard_size)):
+        shards.append((x_name, o_name, min(shard_size, games - start),
+                       size, k, seed * 1_000_003 + n))
+    results = Counter()
+    if workers <= 1:
+        for shard in shards:
+            results.update(_tournament_shard(shard))
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            for shard_result in pool.imap_unordered(_tournament_shard, shards):
+                results.update(shard_result)
+    return results
+
+def tournament_main(argv):
+    parser = argparse.ArgumentParser(description="Турнир ботов крестиков-ноликов")
+    parser.add_argument("--x", default="solver", choices=STRATEGIES)
+    parser.add_argument("--o", default="random", choices=STRATEGIES)
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--size", type=int, default=BOARD_SIZE)
+    parser.add_argument("--k", type=int, default=WIN_LENGTH)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.size != 3 and {args.x, args.o} - {"random", "engine"}:
+        parser.error("minimax, solver и book работают только на поле 3×3")
+
+    start = time.perf_counter()
+    results = run_tournament(args.x, args.o, args.games, args.workers,
+                             args.size, args.k, args.seed)
+    elapsed = time.perf_counter() - start
+
+    total = sum(results.values())
+    print(f"{args.x} (X) против {args.o} (O), поле {args.size}×{args.size}, "
+          f"{args.k} в ряд, процессов: {args.workers}")
+    print(f"Партий: {total} за {elapsed:.2f} с ({total / elapsed:.0f} партий/с)")
+    for label, key in (("Победы X", Player), ("Победы O", Bot), ("Ничьи", "draw")):
+        print(f"{label:<10} {results[key]:>10} ({results[key] / total:.2%})")
+
 if __name__ == "__main__":
-    root = tk.Tk()
-    game = TicTacToe(root)
-    root.mainloop()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == "build-book":
+        start = time.perf_counter()
+        positions = build_book()
+        print(f"Позиций: {positions}, книга построена за "
+              f"{time.perf_counter() - start:.2f} с: {BOOK_FILE}")
+        load_book()
+        print(f"Загрузка книги: {book_load_ms:.3f} мс")
+    elif len(sys.argv) > 1 and sys.argv[1] == "tournament":
+        tournament_main(sys.argv[2:])
+    else:
+        size, k = BOARD_SIZE, WIN_LENGTH
+        if len(sys.argv) > 2:
+            size, k = int(sys.argv[1]), int(sys.argv[2])
+        root = tk.Tk()
+        game = TicTacToe(root, size, k)
+        root.mainloop()
\ No newline at end of file
@@ -1,35 +1,158 @@
 import tkinter as tk
 import hashlib
+import hmac
 import os
+import sys
+import sqlite3
+import time
+import random
+import argparse
+import multiprocessing
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 
 SIZE = 19
 CELL = 30
 WIN_W = SIZE * CELL
 WIN_H = SIZE * CELL + 120
 USERS_FILE = "users.txt"
+USERS_DB = "users.db"
+
+# Хеш хранится строкой "схема$параметры$соль$хеш". Старые записи из
+# users.txt — это голый sha256 без соли, они проверяются как "sha256".
+HASH_SCHEME = "pbkdf2"
+HASH_COSTS = {
+    "sha256": {},
+    "pbkdf2": {"i": 200_000},
+    "scrypt": {"n": 2 ** 14, "r": 8, "p": 1},
+}
+VERIFY_CACHE_SIZE = 256
+
+_verify_cache = OrderedDict()
+
+def _derive(scheme: str, password: str, salt: bytes, params: dict) -> bytes:
+    data = password.encode("utf-8")
+    if scheme == "pbkdf2":
+        return hashlib.pbkdf2_hmac("sha256", data, salt, params["i"])
+    if scheme == "scrypt":
+        return hashlib.scrypt(data, salt=salt, n=params["n"], r=params["r"],
+                              p=params["p"], maxmem=256 * 1024 * 1024)
+    raise ValueError(f"Неизвестная схема хеширования: {scheme}")
+
+def hash_password(password: str, scheme: str = None, **params) -> str:
+    scheme = scheme or HASH_SCHEME
+    if scheme == "sha256":
+        return hashlib.sha256(password.encode("utf-8")).hexdigest()
+    params = {**HASH_COSTS[scheme], **params}
+    salt = os.urandom(16)
+    digest = _derive(scheme, password, salt, params)
+    param_str = ",".join(f"{k}={v}" for k, v in params.items())
+    return f"{scheme}${param_str}${salt.hex()}${digest.hex()}"
+
+def _check_hash(password: str, stored: str) -> bool:
+    if "$" not in stored:
+        return hmac.compare_digest(hash_password(password, "sha256"), stored)
+    scheme, param_str, salt_hex, digest_hex = stored.split("$")
+    params = {k: int(v) for k, v in (p.split("=") for p in param_str.split(","))}
+    digest = _derive(scheme, password, bytes.fromhex(salt_hex), params)
+    return hmac.compare_digest(digest.hex(), digest_hex)
+
+def verify_password(login: str, password: str, stored: str) -> bool:
+    # Недавно проверенные пары (логин, хеш) помнят быстрый HMAC пароля,
+    # чтобы повторный вход в той же сессии не запускал KDF заново
+    key = (login, stored)
+    token = hmac.new(stored.encode("utf-8"), password.encode("utf-8"),
+                     hashlib.sha256).digest()
+    cached = _verify_cache.get(key)
+    if cached is not None and hmac.compare_digest(cached, token):
+        _verify_cache.move_to_end(key)
+        return True
+    if not _check_hash(password, stored):
+        return False
+    _verify_cache[key] = token
+    _verify_cache.move_to_end(key)
+    if len(_verify_cache) > VERIFY_CACHE_SIZE:
+        _verify_cache.popitem(last=False)
+    return True
+
+def needs_rehash(stored: str) -> bool:
+    return not stored.startswith(HASH_SCHEME + "$")
+
+def benchmark_hashing(seconds: float = 0.5):
+    settings = [("sha256", {})]
+    settings += [("pbkdf2", {"i": i}) for i in (10_000, 50_000, 100_000, 200_000, 600_000)]
+    settings += [("scrypt", {"n": 2 ** k, "r": 8, "p": 1}) for k in (12, 13, 14, 15)]
+    print(f"{'Схема':<8} | {'Параметры':<22} | {'Хешей/с':>10}")
+    print("-" * 46)
+    for scheme, params in settings:
+        count = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            hash_password("benchmark-password", scheme, **params)
+            count += 1
+        rate = count / (time.perf_counter() - start)
+        param_str = ",".join(f"{k}={v}" for k, v in params.items()) or "-"
+        print(f"{scheme:<8} | {param_str:<22} | {rate:>10.1f}")
+
+# Пользователи хранятся в таблице SQLite с первичным ключом по логину,
+# поэтому поиск не зависит от числа учётных записей. Старый users.txt
+# импортируется автоматически при первом открытии пустой базы.
+
+_users_db = None
+
+def open_users_db() -> sqlite3.Connection:
+    global _users_db
+    if _users_db is None:
+        _users_db = sqlite3.connect(USERS_DB)
+        with _users_db:
+            _users_db.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                "login TEXT PRIMARY KEY, pwd_hash TEXT NOT NULL)"
+            )
+        empty = _users_db.execute("SELECT 1 FROM users LIMIT 1").fetchone() is None
+        if empty and os.path.exists(USERS_FILE):
+            import_users_txt(USERS_FILE)
+    return _users_db
+
+def import_users_txt(path: str) -> int:
+    rows = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                login, pwd_hash = line.strip().split(":", 1)
+                rows.append((login, pwd_hash))
+    db = open_users_db()
+    with db:
+        db.executemany(
+            "INSERT OR REPLACE INTO users (login, pwd_hash) VALUES (?, ?)", rows
+        )
+    return len(rows)
 
-def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode("utf-8")).hexdigest()
+def find_user(login: str):
+    row = open_users_db().execute(
+        "SELECT pwd_hash FROM users WHERE login = ?", (login,)
+    ).fetchone()
+    return row[0] if row else None
 
 def load_users() -> dict:
-    users = {}
-    if os.path.exists(USERS_FILE):
-        with open(USERS_FILE, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip():
-                    login, pwd_hash = line.strip().split(":")
-                    users[login] = pwd_hash
-    return users
+    return dict(open_users_db().execute("SELECT login, pwd_hash FROM users"))
 
 def save_user(login: str, pwd_hash: str):
-    with open(USERS_FILE, "a", encoding="utf-8") as f:
-        f.write(f"{login}:{pwd_hash}\n")
+    db = open_users_db()
+    with db:
+        db.execute(
+            "INSERT OR REPLACE INTO users (login, pwd_hash) VALUES (?, ?)",
+            (login, pwd_hash)
+        )
 
 
 def create_game_state():
     return {
         "pole": [[0 for _ in range(SIZE)] for _ in range(SIZE)],
+        "bitboard": create_bitboard(),
+        "legal": {(x, y) for y in range(SIZE) for x in range(SIZE)},
         "game_over": False,
+        "result": None,
         "black_stones": 50
     }
 
@@ -75,7 +198,10 @@ def count_open(pole, x, y, length):
             total += 1
     return total
 
-def forbidden_move(pole, x, y):
+def forbidden_move(pole, x, y, bb=None):
+    if bb is not None:
+        return bb_forbidden_move(bb, x, y)
+
     test_pole = [row[:] for row in pole]
     test_pole[y][x] = 1
 
@@ -84,13 +210,136 @@ def forbidden_move(pole, x, y):
 
     return overline or threats >= 2
 
-def has_legal_moves(pole):
+def has_legal_moves(pole, bb=None):
     for y in range(SIZE):
         for x in range(SIZE):
-            if pole[y][x] == 0 and not forbidden_move(pole, x, y):
+            if pole[y][x] == 0 and not forbidden_move(pole, x, y, bb):
                 return True
     return False
 
+# Битборд: каждая линия поля (строка, столбец, две диагонали) хранится
+# как целое число, где бит i — i-я клетка линии. Серии камней и открытые
+# концы считаются сдвигами и масками, без обхода поля и без копирования.
+
+DIRECTIONS = [(1, 0), (0, 1), (1, 1), (1, -1)]
+
+def _build_line_tables():
+    cell_lines = [[] for _ in range(SIZE * SIZE)]
+    line_counts = []
+    for dx, dy in DIRECTIONS:
+        count = 0
+        for y in range(SIZE):
+            for x in range(SIZE):
+                if 0 <= x - dx < SIZE and 0 <= y - dy < SIZE:
+                    continue
+                cells = []
+                nx, ny = x, y
+                while 0 <= nx < SIZE and 0 <= ny < SIZE:
+                    cells.append(ny * SIZE + nx)
+                    nx += dx
+                    ny += dy
+                for bit, idx in enumerate(cells):
+                    cell_lines[idx].append((count, bit, len(cells)))
+                count += 1
+        line_counts.append(count)
+    return [tuple(lines) for lines in cell_lines], line_counts
+
+CELL_LINES, LINE_COUNTS = _build_line_tables()
+LINE_LENGTHS = [[0] * count for count in LINE_COUNTS]
+for _lines in CELL_LINES:
+    for _d, (_line, _bit, _length) in enumerate(_lines):
+        LINE_LENGTHS[_d][_line] = _length
+
+def create_bitboard():
+    return {
+        color: [[0] * count for count in LINE_COUNTS]
+        for color in (1, 2)
+    }
+
+def bitboard_from_pole(pole):
+    bb = create_bitboard()
+    for y in range(SIZE):
+        for x in range(SIZE):
+            if pole[y][x]:
+                bb_place(bb, x, y, pole[y][x])
+    return bb
+
+def bb_place(bb, x, y, color=1):
+    lines = bb[color]
+    for d, (line, bit, _) in enumerate(CELL_LINES[y * SIZE + x]):
+        lines[d][line] |= 1 << bit
+
+def _bb_run(stones, occupied, bit, length):
+    above = stones >> (bit + 1)
+    right = (above ^ (above + 1)).bit_length() - 1
+    gaps = ~stones & ((1 << bit) - 1)
+    left = bit - gaps.bit_length()
+
+    open_ends = 0
+    hi = bit + right + 1
+    if hi < length and not (occupied >> hi) & 1:
+        open_ends += 1
+    lo = bit - left - 1
+    if lo >= 0 and not (occupied >> lo) & 1:
+        open_ends += 1
+    return 1 + left + right, open_ends
+
+def bb_runs(bb, x, y, color=1):
+    own = bb[color]
+    other = bb[3 - color]
+    runs = []
+    for d, (line, bit, length) in enumerate(CELL_LINES[y * SIZE + x]):
+        stones = own[d][line] | (1 << bit)
+        runs.append(_bb_run(stones, stones | other[d][line], bit, length))
+    return runs
+
+def _five_result(runs):
+    for cnt, _ in runs:
+        if cnt == 5:
+            return "win"
+        if cnt > 5:
+            return "overline"
+    return None
+
+def bb_check_five(bb, x, y):
+    return _five_result(bb_runs(bb, x, y))
+
+def bb_count_open(bb, x, y, length):
+    return sum(1 for cnt, open_ends in bb_runs(bb, x, y)
+               if cnt == length and open_ends == 2)
+
+def bb_forbidden_move(bb, x, y):
+    runs = bb_runs(bb, x, y)
+    if _five_result(runs) == "overline":
+        return True
+    threats = sum(1 for cnt, open_ends in runs
+                  if cnt in (3, 4) and open_ends == 2)
+    return threats >= 2
+
+def legal_moves(game_state):
+    return game_state["legal"]
+
+def is_legal_move(game_state, x, y):
+    return (x, y) in game_state["legal"]
+
+def update_legal_moves(game_state, x, y):
+    # Новый камень меняет статус только клеток на четырёх линиях через него
+    pole = game_state["pole"]
+    bb = game_state["bitboard"]
+    legal = game_state["legal"]
+    legal.discard((x, y))
+    for dx, dy in DIRECTIONS:
+        for s in (1, -1):
+            nx, ny = x + dx * s, y + dy * s
+            while 0 <= nx < SIZE and 0 <= ny < SIZE:
+                if pole[ny][nx] == 0:
+                    if bb_forbidden_move(bb, nx, ny):
+                        legal.discard((nx, ny))
+                    else:
+                        legal.add((nx, ny))
+                nx += dx * s
+                ny += dy * s
+
 def make_move(game_state, x, y):
     if game_state["game_over"]:
         return False, "Игра окончена"
@@ -101,23 +350,29 @@ def make_move(game_state, x, y):
     if game_state["pole"][y][x] != 0:
         return False, "Клетка занята"
 
-    if forbidden_move(game_state["pole"], x, y):
+    if not is_legal_move(game_state, x, y):
         return False, "Запрещённый ход"
 
+    bb = game_state["bitboard"]
     game_state["pole"][y][x] = 1
+    bb_place(bb, x, y)
+    update_legal_moves(game_state, x, y)
     game_state["black_stones"] -= 1
 
-    res = check_five(game_state["pole"], x, y)
+    res = bb_check_five(bb, x, y)
     if res == "win":
         game_state["game_over"] = True
+        game_state["result"] = "win"
         return True, "Победа! Построено 5 в ряд."
 
-    if not has_legal_moves(game_state["pole"]):
+    if not game_state["legal"]:
         game_state["game_over"] = True
+        game_state["result"] = "no_moves"
         return True, "Поражение. Нет допустимых ходов."
 
     if game_state["black_stones"] <= 0:
         game_state["game_over"] = True
+        game_state["result"] = "stones_out"
         return True, "Камни закончились. Ничья."
 
     return True, f"Камней осталось: {game_state['black_stones']}"
@@ -126,8 +381,425 @@ def pass_move(game_state):
     if game_state["game_over"]:
         return False, "Игра окончена"
     game_state["game_over"] = True
+    game_state["result"] = "pass"
     return True, "Ничья (пас)"
 
+# Пакетная игра без интерфейса: партии по записанным ходам или случайные
+
+def rejected_move_result(game_state, x, y):
+    pole = game_state["pole"]
+    if not (0 <= x < SIZE and 0 <= y < SIZE) or pole[y][x] != 0:
+        return "invalid"
+    if bb_check_five(game_state["bitboard"], x, y) == "overline":
+        return "overline"
+    return "forbidden"
+
+def play_game(moves=None, seed=None):
+    game_state = create_game_state()
+    rng = random.Random(seed)
+    played = 0
+    while not game_state["game_over"]:
+        if moves is None:
+            x, y = rng.choice(sorted(game_state["legal"]))
+        elif played < len(moves):
+            x, y = moves[played]
+        else:
+            pass_move(game_state)
+            break
+        success, _ = make_move(game_state, x, y)
+        if not success:
+            game_state["result"] = rejected_move_result(game_state, x, y)
+            break
+        played += 1
+    return {
+        "result": game_state["result"],
+        "moves": played,
+        "black_stones": game_state["black_stones"]
+    }
+
+def _play_job(job):
+    moves, seed = job
+    return play_game(moves, seed)
+
+def simulate_games(jobs, workers=1, chunksize=64):
+    if workers <= 1:
+        return [_play_job(job) for job in jobs]
+    with multiprocessing.Pool(workers) as pool:
+        return pool.map(_play_job, jobs, chunksize)
+
+def load_games(path):
+    games = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                games.append([
+                    tuple(int(v) for v in move.split(","))
+                    for move in line.split()
+                ])
+    return games
+
+def simulate_main(argv):
+    parser = argparse.ArgumentParser(description="Пакетная симуляция партий рэндзю")
+    parser.add_argument("--games", type=int, default=1000,
+                        help="число случайных партий")
+    parser.add_argument("--file", help="файл с записанными партиями: x,y x,y ...")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.file:
+        jobs = [(moves, None) for moves in load_games(args.file)]
+    else:
+        jobs = [(None, args.seed + i) for i in range(args.games)]
+
+    start = time.perf_counter()
+    results = simulate_games(jobs, args.workers)
+    elapsed = time.perf_counter() - start
+
+    outcomes = Counter(r["result"] for r in results)
+    print(f"Партий: {len(results)}, процессов: {args.workers}, "
+          f"время: {elapsed:.2f} с ({len(results) / elapsed:.0f} партий/с)")
+    for result, count in outcomes.most_common():
+        print(f"{result:<12} {count}")
+
+# ИИ для рэндзю: итеративное углубление с альфа-бета отсечением и таблицей
+# транспозиций по хешу Зобриста. Оценка — сумма по всем линиям битборда
+# весов "пятёрок" окон, обновляется инкрементально при каждом ходе.
+
+AI_WEIGHTS = (0, 1, 12, 150, 2000, 0)
+AI_WIN = 10 ** 7
+AI_BRANCHING = 12
+AI_RADIUS = 2
+
+_zobrist_rng = random.Random(19)
+ZOBRIST = [(0, _zobrist_rng.getrandbits(64), _zobrist_rng.getrandbits(64))
+           for _ in range(SIZE * SIZE)]
+ZOBRIST_WHITE_TO_MOVE = _zobrist_rng.getrandbits(64)
+
+NEAR_CELLS = [
+    tuple(ny * SIZE + nx
+          for ny in range(max(0, y - AI_RADIUS), min(SIZE, y + AI_RADIUS + 1))
+          for nx in range(max(0, x - AI_RADIUS), min(SIZE, x + AI_RADIUS + 1))
+          if (nx, ny) != (x, y))
+    for y in range(SIZE) for x in range(SIZE)
+]
+
+_line_scores = {}
+
+class _SearchTimeout(Exception):
+    pass
+
+def _line_score(black, white, length):
+    key = (black, white, length)
+    score = _line_scores.get(key)
+    if score is None:
+        score = 0
+        for i in range(length - 4):
+            b = bin(black & (31 << i)).count("1")
+            w = bin(white & (31 << i)).count("1")
+            if b and not w:
+                score += AI_WEIGHTS[b]
+            elif w and not b:
+                score -= AI_WEIGHTS[w]
+        if len(_line_scores) > 500_000:
+            _line_scores.clear()
+        _line_scores[key] = score
+    return score
+
+def create_ai_state(pole, time_limit=1.0):
+    ai = {
+        "pole": [row[:] for row in pole],
+        "bb": bitboard_from_pole(pole),
+        "hash": 0,
+        "score": 0,
+        "near": [0] * (SIZE * SIZE),
+        "stones": 0,
+        "tt": {},
+        "nodes": 0,
+        "deadline": time.perf_counter() + time_limit
+    }
+    for y in range(SIZE):
+        for x in range(SIZE):
+            if pole[y][x]:
+                idx = y * SIZE + x
+                ai["hash"] ^= ZOBRIST[idx][pole[y][x]]
+                ai["stones"] += 1
+                for n in NEAR_CELLS[idx]:
+                    ai["near"][n] += 1
+    black, white = ai["bb"][1], ai["bb"][2]
+    for d, count in enumerate(LINE_COUNTS):
+        for line in range(count):
+            ai["score"] += _line_score(black[d][line], white[d][line],
+                                       LINE_LENGTHS[d][line])
+    return ai
+
+def _move_delta(ai, idx, color):
+    black, white = ai["bb"][1], ai["bb"][2]
+    delta = 0
+    for d, (line, bit, length) in enumerate(CELL_LINES[idx]):
+        b, w = black[d][line], white[d][line]
+        before = _line_score(b, w, length)
+        if color == 1:
+            b |= 1 << bit
+        else:
+            w |= 1 << bit
+        delta += _line_score(b, w, length) - before
+    return delta
+
+def _ai_place(ai, idx, color):
+    x, y = idx % SIZE, idx // SIZE
+    black, white = ai["bb"][1], ai["bb"][2]
+    for d, (line, bit, length) in enumerate(CELL_LINES[idx]):
+        ai["score"] -= _line_score(black[d][line], white[d][line], length)
+        ai["bb"][color][d][line] |= 1 << bit
+        ai["score"] += _line_score(black[d][line], white[d][line], length)
+    ai["pole"][y][x] = color
+    ai["hash"] ^= ZOBRIST[idx][color]
+    ai["stones"] += 1
+    near = ai["near"]
+    for n in NEAR_CELLS[idx]:
+        near[n] += 1
+
+def _ai_undo(ai, idx, color):
+    x, y = idx % SIZE, idx // SIZE
+    black, white = ai["bb"][1], ai["bb"][2]
+    for d, (line, bit, length) in enumerate(CELL_LINES[idx]):
+        ai["score"] -= _line_score(black[d][line], white[d][line], length)
+        ai["bb"][color][d][line] &= ~(1 << bit)
+        ai["score"] += _line_score(black[d][line], white[d][line], length)
+    ai["pole"][y][x] = 0
+    ai["hash"] ^= ZOBRIST[idx][color]
+    ai["stones"] -= 1
+    near = ai["near"]
+    for n in NEAR_CELLS[idx]:
+        near[n] -= 1
+
+def bb_wins(bb, x, y, color):
+    runs = bb_runs(bb, x, y, color)
+    if color == 1:
+        return _five_result(runs) == "win"
+    return any(cnt >= 5 for cnt, _ in runs)
+
+def _ai_wins(ai, idx, color):
+    return bb_wins(ai["bb"], idx % SIZE, idx // SIZE, color)
+
+def _ai_candidates(ai, color, tt_move=None):
+    pole = ai["pole"]
+    near = ai["near"]
+    sign = 1 if color == 1 else -1
+    scored = []
+    for idx in range(SIZE * SIZE):
+        if not near[idx]:
+            continue
+        x, y = idx % SIZE, idx // SIZE
+        if pole[y][x]:
+            continue
+        if color == 1 and bb_forbidden_move(ai["bb"], x, y):
+            continue
+        attack = sign * _move_delta(ai, idx, color)
+        defense = -sign * _move_delta(ai, idx, 3 - color)
+        scored.append((attack + defense, idx))
+    scored.sort(reverse=True)
+    moves = [idx for _, idx in scored[:AI_BRANCHING]]
+    if tt_move is not None and tt_move in moves:
+        moves.remove(tt_move)
+        moves.insert(0, tt_move)
+    return moves
+
+def _negamax(ai, depth, alpha, beta, color):
+    ai["nodes"] += 1
+    if ai["nodes"] & 127 == 0 and time.perf_counter() > ai["deadline"]:
+        raise _SearchTimeout()
+
+    key = ai["hash"] ^ (ZOBRIST_WHITE_TO_MOVE if color == 2 else 0)
+    entry = ai["tt"].get(key)
+    tt_move = None
+    if entry is not None:
+        e_depth, e_score, e_flag, tt_move = entry
+        if e_depth >= depth:
+            if e_flag == 0:
+                return e_score
+            if e_flag == 1:
+                alpha = max(alpha, e_score)
+            else:
+                beta = min(beta, e_score)
+            if alpha >= beta:
+                return e_score
+
+    if depth == 0:
+        return ai["score"] if color == 1 else -ai["score"]
+
+    moves = _ai_candidates(ai, color, tt_move)
+    if not moves:
+        return 0
+
+    orig_alpha = alpha
+    best_score = -AI_WIN * 2
+    best_move = moves[0]
+    for idx in moves:
+        _ai_place(ai, idx, color)
+        try:
+            if _ai_wins(ai, idx, color):
+                score = AI_WIN + depth
+            else:
+                score = -_negamax(ai, depth - 1, -beta, -alpha, 3 - color)
+        finally:
+            _ai_undo(ai, idx, color)
+        if score > best_score:
+            best_score = score
+            best_move = idx
+        alpha = max(alpha, score)
+        if alpha >= beta:
+            break
+
+    if best_score <= orig_alpha:
+        flag = 2
+    elif best_score >= beta:
+        flag = 1
+    else:
+        flag = 0
+    ai["tt"][key] = (depth, best_score, flag, best_move)
+    return best_score
+
+def _search_root(ai, depth, color, moves, alpha=-AI_WIN * 2):
+    best_score = -AI_WIN * 2
+    best_move = None
+    for idx in moves:
+        _ai_place(ai, idx, color)
+        try:
+            if _ai_wins(ai, idx, color):
+                score = AI_WIN + depth
+            else:
+                score = -_negamax(ai, depth - 1, -AI_WIN * 2, -max(alpha, best_score), 3 - color)
+        finally:
+            _ai_undo(ai, idx, color)
+        if best_move is None or score > best_score:
+            best_score = score
+            best_move = idx
+    return best_score, best_move
+
+def ai_move(pole, color=1, time_limit=1.0, max_depth=20):
+    start = time.perf_counter()
+    ai = create_ai_state(pole, time_limit)
+    result = {"move": None, "score": 0, "depth": 0, "nodes": 0}
+
+    if ai["stones"] == 0:
+        result["move"] = (SIZE // 2, SIZE // 2)
+    else:
+        moves = _ai_candidates(ai, color)
+        for depth in range(1, max_depth + 1):
+            if not moves:
+                break
+            try:
+                score, best = _search_root(ai, depth, color, moves)
+            except _SearchTimeout:
+                break
+            result.update(move=(best % SIZE, best // SIZE), score=score, depth=depth)
+            moves.remove(best)
+            moves.insert(0, best)
+            if abs(score) >= AI_WIN:
+                break
+
+    elapsed = time.perf_counter() - start
+    result["nodes"] = ai["nodes"]
+    result["time"] = elapsed
+    result["nps"] = ai["nodes"] / elapsed if elapsed else 0.0
+    return result
+
+def ai_benchmark(moves=10, time_limit=1.0):
+    pole = [[0] * SIZE for _ in range(SIZE)]
+    color = 1
+    for n in range(moves):
+        res = ai_move(pole, color, time_limit)
+        if res["move"] is None:
+            break
+        x, y = res["move"]
+        pole[y][x] = color
+        print(f"{n + 1:>3} {'чёрные' if color == 1 else 'белые':<7} ({x:>2}, {y:>2}) "
+              f"глубина {res['depth']:>2}  узлов {res['nodes']:>7}  "
+              f"{res['nps']:>8.0f} узл/с  {res['time']:.2f} с")
+        if bb_wins(bitboard_from_pole(pole), x, y, color):
+            print("Пять в ряд")
+            break
+        color = 3 - color
+
+# Параллельный поиск: корневые ходы делятся между процессами, каждый ищет
+# свои поддеревья. Лучшая найденная оценка хранится в общей переменной
+# и используется всеми процессами как нижняя граница альфа.
+
+_shared_bound = None
+
+def _init_root_worker(bound):
+    global _shared_bound
+    _shared_bound = bound
+
+def _root_worker(pole, color, depth, moves):
+    ai = create_ai_state(pole, time_limit=float("inf"))
+    results = []
+    for idx in moves:
+        alpha = _shared_bound.value
+        score, _ = _search_root(ai, depth, color, [idx], alpha)
+        exact = score > alpha
+        if exact:
+            with _shared_bound.get_lock():
+                if score > _shared_bound.value:
+                    _shared_bound.value = score
+        results.append((score, exact, idx))
+    return results, ai["nodes"]
+
+def ai_move_parallel(pole, color=1, depth=4, workers=4):
+    start = time.perf_counter()
+    ai = create_ai_state(pole)
+    moves = _ai_candidates(ai, color)
+    result = {"move": None, "score": 0, "depth": depth, "nodes": 0}
+    if ai["stones"] == 0 or not moves:
+        if ai["stones"] == 0:
+            result["move"] = (SIZE // 2, SIZE // 2)
+    else:
+        bound = multiprocessing.Value("q", -AI_WIN * 2)
+        chunks = [moves[i::workers] for i in range(workers) if moves[i::workers]]
+        with ProcessPoolExecutor(len(chunks), initializer=_init_root_worker,
+                                 initargs=(bound,)) as pool:
+            futures = [pool.submit(_root_worker, pole, color, depth, chunk)
+                       for chunk in chunks]
+            best = None
+            for future in futures:
+                results, nodes = future.result()
+                result["nodes"] += nodes
+                for score, exact, idx in results:
+                    key = (exact, score, -moves.index(idx))
+                    if best is None or key > best[0]:
+                        best = (key, score, idx)
+        _, score, idx = best
+        result.update(move=(idx % SIZE, idx // SIZE), score=score)
+
+    elapsed = time.perf_counter() - start
+    result["time"] = elapsed
+    result["nps"] = result["nodes"] / elapsed if elapsed else 0.0
+    return result
+
+def benchmark_parallel_search(depth=4, workers_list=(1, 2, 4, 8), opening=8):
+    pole = [[0] * SIZE for _ in range(SIZE)]
+    color = 1
+    for _ in range(opening):
+        x, y = ai_move(pole, color, time_limit=0.2)["move"]
+        pole[y][x] = color
+        color = 3 - color
+
+    start = time.perf_counter()
+    ai = create_ai_state(pole, time_limit=float("inf"))
+    score, idx = _search_root(ai, depth, color, _ai_candidates(ai, color))
+    base = time.perf_counter() - start
+    print(f"Один процесс: ход ({idx % SIZE}, {idx // SIZE}), оценка {score}, "
+          f"узлов {ai['nodes']}, {base:.2f} с")
+
+    print(f"{'Процессов':<10} | {'Время, с':<9} | {'Узлов':<8} | {'Ускорение':<9} | Ход")
+    print("-" * 56)
+    for workers in workers_list:
+        res = ai_move_parallel(pole, color, depth, workers)
+        print(f"{workers:<10} | {res['time']:<9.2f} | {res['nodes']:<8} | "
+              f"{base / res['time']:<9.2f} | {res['move']}")
+
 def draw_board(canvas):
     for i in range(SIZE):
         canvas.create_line(
@@ -232,11 +904,10 @@ def main():
             show_message_window(root, "Ошибка", 'Пустое поле "Логин" или "Пароль"')
             return
 
-        users = load_users()
-        pwd_hash = hash_password(password)
+        stored_hash = find_user(login)
 
-        if login in users:
-            if users[login] != pwd_hash:
+        if stored_hash is not None:
+            if not verify_password(login, password, stored_hash):
                 win = tk.Toplevel(root)
                 win.geometry("400x120+730+420")
                 win.title("Ошибка")
@@ -246,6 +917,8 @@ def main():
                 tk.Button(win, text="ОК", command=win.destroy).place(x=160, y=70)
                 return
             else:
+                if needs_rehash(stored_hash):
+                    save_user(login, hash_password(password))
                 win = tk.Toplevel(root)
                 win.geometry("400x120+730+420")
                 win.title("Вход")
@@ -257,7 +930,7 @@ def main():
                 ).place(x=140, y=70)
                 return
         else:
-            save_user(login, pwd_hash)
+            save_user(login, hash_password(password))
             win = tk.Toplevel(root)
             win.geometry("400x120+730+420")
             win.title("Регистрация")
@@ -276,4 +949,13 @@ def main():
     root.mainloop()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == "simulate":
+        simulate_main(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == "bench-hash":
+        benchmark_hashing()
+    elif len(sys.argv) > 1 and sys.argv[1] == "bench-ai":
+        ai_benchmark()
+    elif len(sys.argv) > 1 and sys.argv[1] == "bench-parallel":
+        benchmark_parallel_search()
+    else:
+        main()
\ No newline at end of file
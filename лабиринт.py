@@ -1,38 +1,778 @@
 import tkinter as tk
 from tkinter import messagebox
 import random
+import sys
+import time
+import argparse
+from array import array
+import heapq
+import multiprocessing
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import mmap
+import struct
+from collections import deque
 
 cell_size = 20
 maze_width = 21
 maze_height = 21
 animation_delay = 30
+max_view = 800
+PALETTE = {
+    'black': '#000000',
+    'white': '#ffffff',
+    'orange': '#ffa500',
+    'light yellow': '#ffffe0',
+}
 
 maze = []
 bot_x = 0
 bot_y = 0
 exits = []
 searching = False
-visited = set()
+replay = None
+field = None
 
 root = None
 canvas = None
+maze_image = None
+exit_items = {}
+bot_item = None
+route_item = None
 
-def generate_maze(width, height):
-    maze = [[1 for _ in range(width)] for _ in range(height)]
-    
-    def carve(x, y):
-        maze[y][x] = 0
-        directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
-        random.shuffle(directions)
-        
-        for dx, dy in directions:
-            nx, ny = x + dx*2, y + dy*2
-            if 0 < nx < width-1 and 0 < ny < height-1 and maze[ny][nx] == 1:
-                maze[y+dy][x+dx] = 0
-                carve(nx, ny)
-    
-    carve(1, 1)
-    return maze
+MAZE_MODES = ("dfs", "wilson", "eller")
+
+def _carve_dfs(grid, width, height, rng):
+    # Поиск в глубину с явным стеком вместо рекурсии: глубина ограничена
+    # только памятью, поэтому годится для лабиринтов в тысячи клеток
+    steps = (2, -2, 2 * width, -2 * width)
+    start = width + 1
+    grid[start] = 0
+    stack = [start]
+    while stack:
+        idx = stack[-1]
+        x = idx % width
+        options = []
+        for step in steps:
+            n = idx + step
+            if step == 2 or step == -2:
+                if not 0 < x + step < width - 1:
+                    continue
+            elif not width <= n < (height - 1) * width:
+                continue
+            if grid[n]:
+                options.append(step)
+        if not options:
+            stack.pop()
+            continue
+        step = options[rng.randrange(len(options))] if len(options) > 1 else options[0]
+        grid[idx + step // 2] = 0
+        grid[idx + step] = 0
+        stack.append(idx + step)
+
+def _carve_wilson(grid, width, height, rng):
+    # Алгоритм Уилсона: случайные блуждания со стиранием петель дают
+    # равномерно случайное остовное дерево
+    cw, ch = (width - 1) // 2, (height - 1) // 2
+    total = cw * ch
+    in_tree = bytearray(total)
+    heading = [0] * total
+    first = rng.randrange(total)
+    in_tree[first] = 1
+    cy, cx = divmod(first, cw)
+    grid[(2 * cy + 1) * width + 2 * cx + 1] = 0
+    order = list(range(total))
+    rng.shuffle(order)
+    for start in order:
+        if in_tree[start]:
+            continue
+        cell = start
+        while not in_tree[cell]:
+            cy, cx = divmod(cell, cw)
+            options = []
+            if cx > 0: options.append(cell - 1)
+            if cx < cw - 1: options.append(cell + 1)
+            if cy > 0: options.append(cell - cw)
+            if cy < ch - 1: options.append(cell + cw)
+            nxt = options[rng.randrange(len(options))]
+            heading[cell] = nxt
+            cell = nxt
+        cell = start
+        while not in_tree[cell]:
+            in_tree[cell] = 1
+            nxt = heading[cell]
+            cy, cx = divmod(cell, cw)
+            ny, nx = divmod(nxt, cw)
+            grid[(2 * cy + 1) * width + 2 * cx + 1] = 0
+            grid[(cy + ny + 1) * width + cx + nx + 1] = 0
+            cell = nxt
+
+def eller_rows(width, height, rng=random):
+    # Алгоритм Эллера: лабиринт выдаётся построчно, в памяти держится
+    # только текущий ряд клеток, поэтому размер по высоте не ограничен
+    cw, ch = (width - 1) // 2, (height - 1) // 2
+    wall = bytes([1]) * width
+    yield bytearray(wall)
+    labels = [0] * cw
+    next_label = 1
+    for cy in range(ch):
+        last = cy == ch - 1
+        members = {}
+        for i in range(cw):
+            if not labels[i]:
+                labels[i] = next_label
+                next_label += 1
+            members.setdefault(labels[i], []).append(i)
+        row = bytearray(wall)
+        for i in range(cw):
+            row[2 * i + 1] = 0
+        for i in range(cw - 1):
+            a, b = labels[i], labels[i + 1]
+            if a != b and (last or rng.random() < 0.5):
+                row[2 * i + 2] = 0
+                if len(members[a]) < len(members[b]):
+                    a, b = b, a
+                for j in members[b]:
+                    labels[j] = a
+                members[a].extend(members.pop(b))
+        yield row
+        below = bytearray(wall)
+        if not last:
+            carried = [0] * cw
+            for label, cols in members.items():
+                down = [j for j in cols if rng.random() < 0.5]
+                if not down:
+                    down = [cols[rng.randrange(len(cols))]]
+                for j in down:
+                    below[2 * j + 1] = 0
+                    carried[j] = label
+            labels = carried
+        yield below
+    for _ in range(height - 1 - 2 * ch):
+        yield bytearray(wall)
+
+def generate_maze(width, height, mode="dfs", rng=random):
+    if mode == "eller":
+        return list(eller_rows(width, height, rng))
+    grid = bytearray([1]) * (width * height)
+    if width >= 3 and height >= 3:
+        if mode == "dfs":
+            _carve_dfs(grid, width, height, rng)
+        elif mode == "wilson":
+            _carve_wilson(grid, width, height, rng)
+        else:
+            raise ValueError(f"Неизвестный режим генерации: {mode}")
+    return [grid[y*width:(y+1)*width] for y in range(height)]
+
+def benchmark_generation(size=1001, modes=MAZE_MODES, seed=1):
+    for mode in modes:
+        rng = random.Random(seed)
+        start = time.perf_counter()
+        if mode == "eller":
+            rows = sum(1 for _ in eller_rows(size, size, rng))
+        else:
+            rows = len(generate_maze(size, size, mode, rng))
+        elapsed = time.perf_counter() - start
+        print(f"{mode:>7}: {size}x{size} ({rows} строк) за {elapsed:.2f} с, "
+              f"{size * size / elapsed / 1e6:.2f} млн клеток/с")
+
+DIRECTIONS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+def flatten_maze(maze):
+    # Решатели работают с плоским байтовым массивом и индексами y*w+x
+    if isinstance(maze, MappedMaze):
+        return maze.flat(), maze.width, maze.height
+    width = len(maze[0]) if len(maze) else 0
+    return bytes(b"".join(maze)), width, len(maze)
+
+def _steps(width):
+    return tuple(dy * width + dx for dx, dy in DIRECTIONS)
+
+def _exit_flags(grid, width, height, exits):
+    flags = bytearray(len(grid))
+    for x, y in exits:
+        if 0 <= x < width and 0 <= y < height and grid[y*width + x] == 0:
+            flags[y*width + x] = 1
+    return flags
+
+def _open_neighbours(grid, width, height, idx, steps):
+    x = idx % width
+    for step, (dx, dy) in zip(steps, DIRECTIONS):
+        if dx and not 0 <= x + dx < width:
+            continue
+        n = idx + step
+        if 0 <= n < len(grid) and grid[n] == 0:
+            yield n
+
+def _trace_back(parent, idx, width):
+    path = []
+    while True:
+        path.append((idx % width, idx // width))
+        if parent[idx] == idx:
+            break
+        idx = parent[idx]
+    path.reverse()
+    return path
+
+def dfs_solve(maze, start, exits, trace=None):
+    # Обход в глубину в порядке исходного бота; путь восстанавливается
+    # по указателям на родителя, а не копируется при каждом добавлении в стек.
+    # В trace (например, array("l")) дописываются пары (клетка, родитель)
+    # в порядке посещения — по ним GUI потом проигрывает анимацию
+    grid, width, height = flatten_maze(maze)
+    steps = _steps(width)
+    is_exit = _exit_flags(grid, width, height, exits)
+    parent = [-1] * len(grid)
+    origin = start[1]*width + start[0]
+    stack = [(origin, origin)]
+    expanded = 0
+    while stack:
+        idx, prev = stack.pop()
+        if parent[idx] != -1:
+            continue
+        parent[idx] = prev
+        expanded += 1
+        if trace is not None:
+            trace.append(idx)
+            trace.append(prev)
+        if is_exit[idx]:
+            return _trace_back(parent, idx, width), expanded
+        for n in _open_neighbours(grid, width, height, idx, steps):
+            if parent[n] == -1:
+                stack.append((n, idx))
+    return None, expanded
+
+def bfs_solve(maze, start, exits, trace=None):
+    grid, width, height = flatten_maze(maze)
+    steps = _steps(width)
+    is_exit = _exit_flags(grid, width, height, exits)
+    parent = [-1] * len(grid)
+    origin = start[1]*width + start[0]
+    parent[origin] = origin
+    queue = deque([origin])
+    expanded = 0
+    while queue:
+        idx = queue.popleft()
+        expanded += 1
+        if trace is not None:
+            trace.append(idx)
+            trace.append(parent[idx])
+        if is_exit[idx]:
+            return _trace_back(parent, idx, width), expanded
+        for n in _open_neighbours(grid, width, height, idx, steps):
+            if parent[n] == -1:
+                parent[n] = idx
+                queue.append(n)
+    return None, expanded
+
+def astar_solve(maze, start, exits):
+    # A* к ближайшему из выходов: эвристика — манхэттенское расстояние
+    # до ближайшего выхода, она допустима, поэтому путь кратчайший
+    grid, width, height = flatten_maze(maze)
+    steps = _steps(width)
+    is_exit = _exit_flags(grid, width, height, exits)
+    targets = [(i % width, i // width) for i, flag in enumerate(is_exit) if flag]
+    if not targets:
+        return None, 0
+
+    def estimate(idx):
+        x, y = idx % width, idx // width
+        return min(abs(x - tx) + abs(y - ty) for tx, ty in targets)
+
+    parent = [-1] * len(grid)
+    cost = {}
+    origin = start[1]*width + start[0]
+    parent[origin] = origin
+    cost[origin] = 0
+    heap = [(estimate(origin), 0, origin)]
+    closed = bytearray(len(grid))
+    expanded = 0
+    while heap:
+        _, g, idx = heapq.heappop(heap)
+        if closed[idx]:
+            continue
+        closed[idx] = 1
+        expanded += 1
+        if is_exit[idx]:
+            return _trace_back(parent, idx, width), expanded
+        for n in _open_neighbours(grid, width, height, idx, steps):
+            if closed[n] or cost.get(n, g + 2) <= g + 1:
+                continue
+            cost[n] = g + 1
+            parent[n] = idx
+            heapq.heappush(heap, (g + 1 + estimate(n), g + 1, n))
+    return None, expanded
+
+def bidirectional_solve(maze, start, exits):
+    # Встречный BFS: прямая волна от старта, обратная — сразу от всех выходов;
+    # каждый раз расширяется меньший фронт, уровень обходится целиком
+    grid, width, height = flatten_maze(maze)
+    steps = _steps(width)
+    is_exit = _exit_flags(grid, width, height, exits)
+    origin = start[1]*width + start[0]
+    sources = [i for i, flag in enumerate(is_exit) if flag]
+    if not sources:
+        return None, 0
+    if is_exit[origin]:
+        return [tuple(start)], 1
+    fwd = [-1] * len(grid)
+    bwd = [-1] * len(grid)
+    dist = [0] * len(grid)
+    fwd[origin] = origin
+    for i in sources:
+        bwd[i] = i
+    front_f, front_b = [origin], sources
+    depth_f = depth_b = 0
+    expanded = 0
+    while front_f and front_b:
+        best = best_total = None
+        if len(front_f) <= len(front_b):
+            nxt = []
+            depth_f += 1
+            for idx in front_f:
+                expanded += 1
+                for n in _open_neighbours(grid, width, height, idx, steps):
+                    if fwd[n] != -1:
+                        continue
+                    fwd[n] = idx
+                    nxt.append(n)
+                    if bwd[n] != -1:
+                        total = depth_f + dist[n]
+                        if best is None or total < best_total:
+                            best, best_total = n, total
+                    else:
+                        dist[n] = depth_f
+            front_f = nxt
+        else:
+            nxt = []
+            depth_b += 1
+            for idx in front_b:
+                expanded += 1
+                for n in _open_neighbours(grid, width, height, idx, steps):
+                    if bwd[n] != -1:
+                        continue
+                    bwd[n] = idx
+                    nxt.append(n)
+                    if fwd[n] != -1:
+                        total = depth_b + dist[n]
+                        if best is None or total < best_total:
+                            best, best_total = n, total
+                    else:
+                        dist[n] = depth_b
+            front_b = nxt
+        if best is not None:
+            path = _trace_back(fwd, best, width)
+            idx = best
+            while bwd[idx] != idx:
+                idx = bwd[idx]
+                path.append((idx % width, idx // width))
+            return path, expanded
+    return None, expanded
+
+SOLVERS = {
+    "dfs": dfs_solve,
+    "bfs": bfs_solve,
+    "astar": astar_solve,
+    "bidir": bidirectional_solve,
+}
+
+MAZE_MAGIC = b"MAZE"
+MAZE_VERSION = 1
+MAZE_HEADER = struct.Struct("<4sBxxxIIIII")
+# Распаковка/упаковка 8 клеток (бит 1 — стена, старший бит — левая клетка)
+UNPACK_BITS = [bytes((b >> (7 - i)) & 1 for i in range(8)) for b in range(256)]
+PACK_BITS = {bits: b for b, bits in enumerate(UNPACK_BITS)}
+
+def _pack_row(row, stride):
+    row = bytes(row).ljust(stride * 8, b"\x00")
+    return bytes(PACK_BITS[row[i:i+8]] for i in range(0, len(row), 8))
+
+def save_maze(path, maze, start, exits):
+    # Строки пишутся по мере поступления, поэтому можно сохранять
+    # лабиринт прямо из потокового генератора eller_rows
+    exits = list(exits)
+    exit_data = struct.pack(f"<{2 * len(exits)}I", *[v for e in exits for v in e])
+    width = height = 0
+    with open(path, "wb") as f:
+        f.write(bytes(MAZE_HEADER.size) + exit_data)
+        for row in maze:
+            if not height:
+                width = len(row)
+                stride = (width + 7) // 8
+            f.write(_pack_row(row, stride))
+            height += 1
+        f.seek(0)
+        f.write(MAZE_HEADER.pack(MAZE_MAGIC, MAZE_VERSION, width, height,
+                                 start[0], start[1], len(exits)))
+
+class MappedMaze:
+    # Лабиринт из бинарного файла, отображённого в память через mmap:
+    # строки распаковываются только при обращении maze[y]
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, width, height, sx, sy, count = MAZE_HEADER.unpack_from(self.data)
+        if magic != MAZE_MAGIC or version != MAZE_VERSION:
+            self.data.close()
+            raise ValueError(f"{path}: не файл лабиринта")
+        self.width, self.height = width, height
+        self.start = (sx, sy)
+        values = struct.unpack_from(f"<{2 * count}I", self.data, MAZE_HEADER.size)
+        self.exits = list(zip(values[::2], values[1::2]))
+        self.offset = MAZE_HEADER.size + 8 * count
+        self.stride = (width + 7) // 8
+
+    def __len__(self):
+        return self.height
+
+    def packed_row(self, y):
+        start = self.offset + y * self.stride
+        return memoryview(self.data)[start:start + self.stride]
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.height:
+            raise IndexError(y)
+        return bytearray(b"".join(map(UNPACK_BITS.__getitem__, self.packed_row(y)))[:self.width])
+
+    def __iter__(self):
+        return (self[y] for y in range(self.height))
+
+    def flat(self):
+        width, stride = self.width, self.stride
+        packed = memoryview(self.data)[self.offset:self.offset + stride * self.height]
+        unpacked = b"".join(map(UNPACK_BITS.__getitem__, packed))
+        if width == stride * 8:
+            return unpacked
+        return b"".join(unpacked[i:i + width] for i in range(0, len(unpacked), stride * 8))
+
+    def close(self):
+        self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def load_maze(path):
+    maze = MappedMaze(path)
+    return maze, maze.start, maze.exits
+
+def save_maze_text(path, maze, start, exits):
+    # Текстовый вид для маленьких лабиринтов: # стена, . проход, S старт, E выход
+    marks = {tuple(start): "S"}
+    marks.update((tuple(e), "E") for e in exits)
+    with open(path, "w", encoding="utf-8") as f:
+        for y, row in enumerate(maze):
+            f.write("".join(marks.get((x, y), "#" if cell else ".") for x, cell in enumerate(row)))
+            f.write("\n")
+
+def load_maze_text(path):
+    maze, start, exits = [], None, []
+    with open(path, encoding="utf-8") as f:
+        for y, line in enumerate(f):
+            line = line.rstrip("\n")
+            if not line:
+                continue
+            for x, ch in enumerate(line):
+                if ch == "S":
+                    start = (x, y)
+                elif ch == "E":
+                    exits.append((x, y))
+            maze.append(bytearray(ch == "#" for ch in line))
+    return maze, start, exits
+
+def open_maze_file(path):
+    if path.endswith(".txt"):
+        return load_maze_text(path)
+    return load_maze(path)
+
+def write_maze_file(path, maze, start, exits):
+    if path.endswith(".txt"):
+        save_maze_text(path, maze, start, exits)
+    else:
+        save_maze(path, maze, start, exits)
+
+def random_task(size, exit_count, rng):
+    centre = (size // 2) | 1
+    cells = [(x, y) for y in range(1, size, 2) for x in range(1, size, 2)]
+    return (centre, centre), rng.sample(cells, exit_count)
+
+def benchmark_solvers(size=1001, exit_count=4, seed=1, solvers=SOLVERS, maze_file=None):
+    if maze_file:
+        maze, start, exits = open_maze_file(maze_file)
+    else:
+        rng = random.Random(seed)
+        maze = generate_maze(size, size, "dfs", rng)
+        start, exits = random_task(size, exit_count, rng)
+    print(f"Лабиринт {len(maze[0])}x{len(maze)}, выходов: {len(exits)}, старт {start}")
+    for name in solvers:
+        began = time.perf_counter()
+        path, expanded = SOLVERS[name](maze, start, exits)
+        elapsed = time.perf_counter() - began
+        length = len(path) - 1 if path else "-"
+        print(f"{name:>6}: раскрыто {expanded:>8}, длина пути {length:>6}, {elapsed * 1000:9.1f} мс")
+
+UNREACHABLE = 2**31 - 1
+
+class DistanceField:
+    # Расстояние от каждой клетки до ближайшего выхода (BFS сразу от всех
+    # выходов) и номер этого выхода. Маршрут из любой клетки — спуск по
+    # градиенту за O(длины пути); выходы добавляются и снимаются инкрементально
+    def __init__(self, maze, exits=()):
+        self.grid, self.width, self.height = flatten_maze(maze)
+        self.steps = _steps(self.width)
+        size = len(self.grid)
+        self.dist = array("i", [UNREACHABLE]) * size
+        self.source = array("i", [-1]) * size
+        self.exits = set()
+        queue = deque()
+        for x, y in exits:
+            idx = y*self.width + x
+            if self.grid[idx] == 0 and idx not in self.exits:
+                self.exits.add(idx)
+                self.dist[idx] = 0
+                self.source[idx] = idx
+                queue.append(idx)
+        self._spread(queue)
+
+    def _neighbours(self, idx):
+        return _open_neighbours(self.grid, self.width, self.height, idx, self.steps)
+
+    def _spread(self, queue):
+        grid, dist, source, width = self.grid, self.dist, self.source, self.width
+        size = len(grid)
+        while queue:
+            idx = queue.popleft()
+            d = dist[idx] + 1
+            src = source[idx]
+            x = idx % width
+            for n in (idx + width, idx + 1, idx - width, idx - 1):
+                if (n == idx + 1 and x == width - 1) or (n == idx - 1 and x == 0):
+                    continue
+                if 0 <= n < size and not grid[n] and d < dist[n]:
+                    dist[n] = d
+                    source[n] = src
+                    queue.append(n)
+
+    def add_exit(self, x, y):
+        # Новый выход перекрашивает только клетки, к которым он ближе
+        idx = y*self.width + x
+        if self.grid[idx] or idx in self.exits:
+            return
+        self.exits.add(idx)
+        self.dist[idx] = 0
+        self.source[idx] = idx
+        self._spread(deque([idx]))
+
+    def remove_exit(self, x, y):
+        # Стираем область, которую обслуживал выход, и доращиваем её
+        # от границы с соседними областями (Дейкстра с разными стартовыми
+        # расстояниями); остальная часть поля не трогается
+        idx = y*self.width + x
+        if idx not in self.exits:
+            return
+        self.exits.discard(idx)
+        dist, source = self.dist, self.source
+        region = [idx]
+        source[idx] = -1
+        dist[idx] = UNREACHABLE
+        border = []
+        i = 0
+        while i < len(region):
+            for n in self._neighbours(region[i]):
+                if source[n] == idx:
+                    source[n] = -1
+                    dist[n] = UNREACHABLE
+                    region.append(n)
+                elif dist[n] < UNREACHABLE:
+                    border.append((dist[n], n))
+            i += 1
+        heapq.heapify(border)
+        while border:
+            d, cell = heapq.heappop(border)
+            if d > dist[cell]:
+                continue
+            for n in self._neighbours(cell):
+                if d + 1 < dist[n]:
+                    dist[n] = d + 1
+                    source[n] = source[cell]
+                    heapq.heappush(border, (d + 1, n))
+
+    def toggle_exit(self, x, y):
+        if y*self.width + x in self.exits:
+            self.remove_exit(x, y)
+        else:
+            self.add_exit(x, y)
+
+    def distance(self, x, y):
+        d = self.dist[y*self.width + x]
+        return None if d == UNREACHABLE else d
+
+    def route(self, x, y):
+        idx = y*self.width + x
+        d = self.dist[idx]
+        if self.grid[idx]:
+            d = min((self.dist[n] + 1 for n in self._neighbours(idx)), default=UNREACHABLE)
+        if d >= UNREACHABLE:
+            return None
+        path = [(x, y)]
+        while d > 0:
+            d -= 1
+            idx = next(n for n in self._neighbours(idx) if self.dist[n] == d)
+            path.append((idx % self.width, idx // self.width))
+        return path
+
+def benchmark_distance_field(size=1001, exit_count=16, queries=1000, toggles=20, seed=1):
+    rng = random.Random(seed)
+    maze = generate_maze(size, size, "dfs", rng)
+    _, exits = random_task(size, exit_count, rng)
+    cells = [(x, y) for y in range(1, size, 2) for x in range(1, size, 2)]
+    print(f"Лабиринт {size}x{size}, выходов: {exit_count}")
+
+    began = time.perf_counter()
+    field = DistanceField(maze, exits)
+    build = time.perf_counter() - began
+    print(f"Построение поля: {build * 1000:.1f} мс")
+
+    starts = [rng.choice(cells) for _ in range(queries)]
+    began = time.perf_counter()
+    steps = sum(len(field.route(x, y) or ()) for x, y in starts)
+    elapsed = time.perf_counter() - began
+    print(f"Маршрут по полю: {elapsed / queries * 1000:.3f} мс на запрос, "
+          f"в среднем {steps / queries:.0f} клеток")
+    began = time.perf_counter()
+    for x, y in starts[:10]:
+        bfs_solve(maze, (x, y), exits)
+    elapsed = time.perf_counter() - began
+    print(f"bfs_solve с нуля: {elapsed / 10 * 1000:.3f} мс на запрос")
+
+    picks = [rng.choice(cells) for _ in range(toggles)]
+    began = time.perf_counter()
+    for x, y in picks + picks[::-1]:
+        field.toggle_exit(x, y)
+    elapsed = time.perf_counter() - began
+    print(f"Переключение выхода: {elapsed / (2 * toggles) * 1000:.2f} мс "
+          f"(пересчёт целиком: {build * 1000:.1f} мс)")
+
+_explorer = {}
+
+def _init_explorer(grid, visited, width, exit_cells, found, found_time):
+    # В процессах grid и visited — имена блоков SharedMemory,
+    # в потоках — сами буферы
+    if isinstance(grid, str):
+        grid_shm = shared_memory.SharedMemory(grid)
+        visited_shm = shared_memory.SharedMemory(visited)
+        _explorer["shm"] = (grid_shm, visited_shm)
+        grid, visited = grid_shm.buf, visited_shm.buf
+    _explorer.update(grid=grid, visited=visited, width=width, exits=set(exit_cells),
+                     found=found, found_time=found_time)
+
+def _explore_agent(seeds):
+    # Агент обходит свою часть фронта в глубину; клетка захватывается
+    # в общей карте посещений при добавлении в стек, поэтому агенты
+    # почти не пересекаются. Флаг found проверяется раз в 1024 клетки
+    grid, visited, width = _explorer["grid"], _explorer["visited"], _explorer["width"]
+    exit_cells, found = _explorer["exits"], _explorer["found"]
+    size = len(grid)
+    stack = list(seeds)
+    count = 0
+    while stack:
+        if not count & 1023 and found.value >= 0:
+            break
+        idx = stack.pop()
+        count += 1
+        if idx in exit_cells:
+            with found.get_lock():
+                if found.value < 0:
+                    found.value = idx
+                    _explorer["found_time"].value = time.time()
+            break
+        x = idx % width
+        for n in (idx + width, idx + 1, idx - width, idx - 1):
+            if (n == idx + 1 and x == width - 1) or (n == idx - 1 and x == 0):
+                continue
+            if 0 <= n < size and not grid[n] and not visited[n]:
+                visited[n] = 1
+                stack.append(n)
+    return count
+
+def explore_parallel(maze, start, exits, agents=4, use_threads=False):
+    began = time.time()
+    grid, width, height = flatten_maze(maze)
+    steps = _steps(width)
+    is_exit = _exit_flags(grid, width, height, exits)
+    exit_cells = [i for i, flag in enumerate(is_exit) if flag]
+    result = {"found": None, "first_exit": None, "visited": 0}
+    visited = bytearray(len(grid))
+    origin = start[1]*width + start[0]
+    visited[origin] = 1
+
+    # Короткий BFS от старта набирает фронт, который делится между агентами
+    frontier = deque([origin])
+    while frontier and len(frontier) < agents * 4:
+        idx = frontier.popleft()
+        result["visited"] += 1
+        if is_exit[idx]:
+            result.update(found=(idx % width, idx // width), first_exit=time.time() - began)
+            break
+        for n in _open_neighbours(grid, width, height, idx, steps):
+            if not visited[n]:
+                visited[n] = 1
+                frontier.append(n)
+    if result["found"] is None and frontier:
+        frontier = list(frontier)
+        chunks = [frontier[i::agents] for i in range(agents) if frontier[i::agents]]
+        found = multiprocessing.Value("q", -1)
+        found_time = multiprocessing.Value("d", 0.0)
+        if use_threads:
+            pool = ThreadPoolExecutor(len(chunks), initializer=_init_explorer,
+                                      initargs=(grid, visited, width, exit_cells, found, found_time))
+            blocks = ()
+        else:
+            blocks = (shared_memory.SharedMemory(create=True, size=len(grid)),
+                      shared_memory.SharedMemory(create=True, size=len(grid)))
+            blocks[0].buf[:len(grid)] = grid
+            blocks[1].buf[:len(grid)] = visited
+            pool = ProcessPoolExecutor(len(chunks), initializer=_init_explorer,
+                                       initargs=(blocks[0].name, blocks[1].name, width,
+                                                 exit_cells, found, found_time))
+        try:
+            with pool:
+                result["visited"] += sum(pool.map(_explore_agent, chunks))
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+        if found.value >= 0:
+            result["found"] = (found.value % width, found.value // width)
+            result["first_exit"] = found_time.value - began
+    result["time"] = time.time() - began
+    return result
+
+def benchmark_exploration(size=2001, exit_count=4, seed=1, agents_list=(1, 2, 4, 8),
+                          use_threads=False, maze_file=None):
+    if maze_file:
+        maze, start, exits = open_maze_file(maze_file)
+    else:
+        rng = random.Random(seed)
+        maze = generate_maze(size, size, "dfs", rng)
+        start, exits = random_task(size, exit_count, rng)
+    print(f"Лабиринт {len(maze[0])}x{len(maze)}, выходов: {len(exits)}, старт {start}")
+
+    began = time.perf_counter()
+    path, expanded = dfs_solve(maze, start, exits)
+    base = time.perf_counter() - began
+    where = path[-1] if path else "-"
+    print(f"Один агент (dfs_solve): выход {where}, посещено {expanded}, {base:.2f} с")
+
+    kind = "Потоков" if use_threads else "Процессов"
+    print(f"{kind:<9} | {'До выхода, с':<12} | {'Всего, с':<8} | {'Посещено':<9} | Выход")
+    print("-" * 62)
+    for agents in agents_list:
+        res = explore_parallel(maze, start, exits, agents, use_threads)
+        first = f"{res['first_exit']:.2f}" if res["first_exit"] is not None else "-"
+        print(f"{agents:<9} | {first:<12} | {res['time']:<8.2f} | {res['visited']:<9} | {res['found']}")
 
 def setup_gui():
     global root, canvas
@@ -40,13 +780,27 @@ def setup_gui():
     root = tk.Tk()
     root.title("Лабиринт")
     
+    # Большие лабиринты показываются в окне не больше max_view пикселей
+    # с прокруткой; всё поле при этом — одна картинка на холсте
+    full_w, full_h = maze_width * cell_size, maze_height * cell_size
+    view_frame = tk.Frame(root)
+    view_frame.pack(pady=10)
     canvas = tk.Canvas(
-        root, 
-        width=maze_width * cell_size,
-        height=maze_height * cell_size,
-        bg='white'
+        view_frame, 
+        width=min(full_w, max_view),
+        height=min(full_h, max_view),
+        bg='white',
+        scrollregion=(0, 0, full_w, full_h)
     )
-    canvas.pack(pady=10)
+    if full_w > max_view:
+        xbar = tk.Scrollbar(view_frame, orient=tk.HORIZONTAL, command=canvas.xview)
+        canvas.config(xscrollcommand=xbar.set)
+        xbar.pack(side=tk.BOTTOM, fill=tk.X)
+    if full_h > max_view:
+        ybar = tk.Scrollbar(view_frame, orient=tk.VERTICAL, command=canvas.yview)
+        canvas.config(yscrollcommand=ybar.set)
+        ybar.pack(side=tk.RIGHT, fill=tk.Y)
+    canvas.pack(side=tk.LEFT)
     canvas.bind("<Button-1>", on_canvas_click)
     
     button_frame = tk.Frame(root)
@@ -54,76 +808,123 @@ def setup_gui():
     
     tk.Button(button_frame, text="Новый лабиринт", command=generate_new_maze).pack(side=tk.LEFT, padx=5)
     tk.Button(button_frame, text="Начать поиск", command=start_search).pack(side=tk.LEFT, padx=5)
+    tk.Button(button_frame, text="Кратчайший путь", command=show_route).pack(side=tk.LEFT, padx=5)
     tk.Button(button_frame, text="Очистить выходы", command=clear_exits).pack(side=tk.LEFT, padx=5)
 
+def render_maze_image():
+    # Лабиринт рисуется в картинку по пикселю на клетку одним вызовом put,
+    # затем растягивается zoom до размера клетки — вместо W*H прямоугольников
+    image = tk.PhotoImage(width=maze_width, height=maze_height)
+    colors = (PALETTE['white'], PALETTE['black'])
+    rows = " ".join("{" + " ".join(map(colors.__getitem__, row)) + "}" for row in maze)
+    image.put(rows, to=(0, 0))
+    if cell_size > 1:
+        image = image.zoom(cell_size)
+    return image
+
 def draw_maze():
-    global maze, bot_x, bot_y, exits
+    global maze_image, exit_items, bot_item, route_item
     
     canvas.delete("all")
     
-    for y in range(maze_height):
-        for x in range(maze_width):
-            color = 'black' if maze[y][x] == 1 else 'white'
-            canvas.create_rectangle(
-                x * cell_size, y * cell_size,
-                (x + 1) * cell_size, (y + 1) * cell_size,
-                fill=color, outline='gray'
-            )
+    maze_image = render_maze_image()
+    canvas.create_image(0, 0, anchor=tk.NW, image=maze_image)
+    if cell_size >= 6:
+        full_w, full_h = maze_width * cell_size, maze_height * cell_size
+        for x in range(maze_width + 1):
+            canvas.create_line(x * cell_size, 0, x * cell_size, full_h, fill='gray')
+        for y in range(maze_height + 1):
+            canvas.create_line(0, y * cell_size, full_w, y * cell_size, fill='gray')
     
+    route_item = None
+    exit_items = {}
     for ex, ey in exits:
-        canvas.create_rectangle(
-            ex * cell_size, ey * cell_size,
-            (ex + 1) * cell_size, (ey + 1) * cell_size,
-            fill='green', outline=''
-        )
+        draw_exit(ex, ey)
     
+    bot_item = canvas.create_oval(0, 0, 0, 0, fill='blue', outline='blue')
     draw_bot()
 
+def draw_exit(x, y):
+    exit_items[(x, y)] = canvas.create_rectangle(
+        x * cell_size, y * cell_size,
+        (x + 1) * cell_size, (y + 1) * cell_size,
+        fill='green', outline=''
+    )
+    if bot_item is not None:
+        canvas.tag_raise(bot_item)
+
 def draw_bot():
-    global bot_x, bot_y
+    radius = max(cell_size / 2 - 2, 3)
+    cx = (bot_x + 0.5) * cell_size
+    cy = (bot_y + 0.5) * cell_size
     
-    x1 = bot_x * cell_size + 2
-    y1 = bot_y * cell_size + 2
-    x2 = (bot_x + 1) * cell_size - 2
-    y2 = (bot_y + 1) * cell_size - 2
+    canvas.coords(bot_item, cx - radius, cy - radius, cx + radius, cy + radius)
+
+def paint_cell(idx, color):
+    y, x = divmod(idx, maze_width)
+    maze_image.put(PALETTE[color], to=(x * cell_size, y * cell_size,
+                                       (x + 1) * cell_size, (y + 1) * cell_size))
+
+def draw_route(path):
+    # Маршрут — одна ломаная поверх картинки, а не перекраска клеток
+    global route_item
     
-    canvas.create_oval(x1, y1, x2, y2, fill='blue', outline='blue')
+    if route_item is not None:
+        canvas.delete(route_item)
+        route_item = None
+    if path and len(path) > 1:
+        points = [v for x, y in path for v in ((x + 0.5) * cell_size, (y + 0.5) * cell_size)]
+        route_item = canvas.create_line(*points, fill=PALETTE['orange'],
+                                        width=max(cell_size // 3, 1))
+        canvas.tag_raise(bot_item)
 
 def on_canvas_click(event):
-    global exits, searching
-    
     if searching:
         return
         
-    x = event.x // cell_size
-    y = event.y // cell_size
+    x = int(canvas.canvasx(event.x)) // cell_size
+    y = int(canvas.canvasy(event.y)) // cell_size
     
     if (0 <= x < maze_width and 0 <= y < maze_height and 
         maze[y][x] == 0):
-        if (x, y) in exits:
+        if (x, y) in exit_items:
             exits.remove((x, y))
+            canvas.delete(exit_items.pop((x, y)))
         else:
             exits.append((x, y))
-        draw_maze()
+            draw_exit(x, y)
+        if field is not None:
+            field.toggle_exit(x, y)
 
 def clear_exits():
-    global exits
+    global exits, field
     exits = []
-    draw_maze()
+    field = None
+    for item in exit_items.values():
+        canvas.delete(item)
+    exit_items.clear()
+
+def stop_replay():
+    global replay, searching
+    
+    if replay is not None and replay["job"] is not None:
+        root.after_cancel(replay["job"])
+    replay = None
+    searching = False
 
 def generate_new_maze():
-    global maze, bot_x, bot_y, exits, searching, visited
+    global maze, bot_x, bot_y, exits, field
     
+    stop_replay()
     maze = generate_maze(maze_width, maze_height)
+    field = None
     bot_x = maze_width // 2
     bot_y = maze_height // 2
     exits = []
-    searching = False
-    visited = set()
     draw_maze()
 
 def start_search():
-    global searching, visited
+    global searching
     
     if not exits:
         messagebox.showwarning("Предупреждение", "Сначала установите выходы кликом мыши!")
@@ -133,84 +934,152 @@ def start_search():
         return
         
     searching = True
-    visited = set()
     root.after(100, dfs_search)
 
+def show_route():
+    global field
+    
+    if not exits:
+        messagebox.showwarning("Предупреждение", "Сначала установите выходы кликом мыши!")
+        return
+    
+    if searching:
+        return
+    
+    # Поле расстояний строится один раз и дальше обновляется кликами,
+    # так что маршрут из текущей позиции бота — просто спуск по нему
+    if field is None:
+        field = DistanceField(maze, exits)
+    path = field.route(bot_x, bot_y)
+    draw_maze()
+    if path is None:
+        messagebox.showinfo("Маршрут", "Ни один выход недостижим")
+        return
+    draw_route(path)
+
 def dfs_search():
-    global searching, visited, bot_x, bot_y
+    global replay
     
     if not searching:
         return
-        
-    stack = [(bot_x, bot_y, [])]
-    visited = set()
     
-    while stack and searching:
-        x, y, path = stack.pop()
-        
-        if (x, y) in visited:
-            continue
-            
-        visited.add((x, y))
-        bot_x, bot_y = x, y
-        
-        visualize_step(x, y, "visiting", path)
+    # Поиск выполняется целиком заранее, без отрисовки; анимация потом
+    # проигрывает записанный след, перекрашивая только изменившиеся клетки
+    trace = array("l")
+    path, _ = dfs_solve(maze, (bot_x, bot_y), exits, trace)
+    draw_maze()
+    replay = {"trace": trace, "pos": 0, "chain": [], "found": path is not None, "job": None}
+    replay_step()
 
-        if (x, y) in exits:
-            visualize_step(x, y, "found", path)
-            messagebox.showinfo("Успех", f"Выход найден в позиции ({x}, {y})")
-            searching = False
-            return
-        
-        directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            if (0 <= nx < maze_width and 0 <= ny < maze_height and 
-                maze[ny][nx] == 0 and (nx, ny) not in visited):
-                stack.append((nx, ny, path + [(x, y)]))
-        
-        root.update()
-        root.after(animation_delay)
+def replay_step():
+    global bot_x, bot_y, searching, replay
     
-    searching = False
-
-def visualize_step(x, y, state, path):
-    global maze, exits
+    if replay is None:
+        return
+    replay["job"] = None
+    trace, pos, chain = replay["trace"], replay["pos"], replay["chain"]
     
-    canvas.delete("all")
-
-    for yy in range(maze_height):
-        for xx in range(maze_width):
-            color = 'black' if maze[yy][xx] == 1 else 'white'
-            if (xx, yy) in path:
-                color = 'orange'
-            elif (xx, yy) in visited and (xx, yy) != (x, y):
-                color = 'light yellow'
-            canvas.create_rectangle(
-                xx * cell_size, yy * cell_size,
-                (xx + 1) * cell_size, (yy + 1) * cell_size,
-                fill=color, outline='gray'
-            )
-    for ex, ey in exits:
-        canvas.create_rectangle(
-            ex * cell_size, ey * cell_size,
-            (ex + 1) * cell_size, (ey + 1) * cell_size,
-            fill='green', outline=''
-        )
-
-    if state == "found":
-        canvas.create_rectangle(
-            x * cell_size, y * cell_size,
-            (x + 1) * cell_size, (y + 1) * cell_size,
-            fill='green', outline=''
-        )
-
+    if pos >= len(trace):
+        searching = False
+        if replay["found"]:
+            messagebox.showinfo("Успех", f"Выход найден в позиции ({bot_x}, {bot_y})")
+        replay = None
+        return
+    
+    node, parent = trace[pos], trace[pos + 1]
+    replay["pos"] = pos + 2
+    
+    # chain — путь от старта до текущей клетки; при возврате из тупика
+    # снимаем клетки, пока наверху не окажется родитель новой клетки
+    if chain:
+        while chain[-1] != parent:
+            paint_cell(chain.pop(), 'light yellow')
+        paint_cell(parent, 'orange')
+    chain.append(node)
+    bot_y, bot_x = divmod(node, maze_width)
+    paint_cell(node, 'black' if maze[bot_y][bot_x] == 1 else 'white')
     draw_bot()
+    
+    replay["job"] = root.after(animation_delay, replay_step)
 
-def main():
+def main(width=None, height=None):
+    global maze_width, maze_height, cell_size
+    
+    if width and height:
+        maze_width, maze_height = width, height
+        cell_size = max(1, min(cell_size, max_view // max(width, height)))
     setup_gui()
     generate_new_maze()
     root.mainloop()
 
+def bench_main(argv):
+    parser = argparse.ArgumentParser(prog="лабиринт.py bench-gen")
+    parser.add_argument("--size", type=int, default=1001)
+    parser.add_argument("--mode", choices=MAZE_MODES, action="append")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+    benchmark_generation(args.size, args.mode or MAZE_MODES, args.seed)
+
+def bench_solve_main(argv):
+    parser = argparse.ArgumentParser(prog="лабиринт.py bench-solve")
+    parser.add_argument("--size", type=int, default=1001)
+    parser.add_argument("--exits", type=int, default=4)
+    parser.add_argument("--solver", choices=list(SOLVERS), action="append")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--maze", help="файл лабиринта (.txt или бинарный)")
+    args = parser.parse_args(argv)
+    benchmark_solvers(args.size, args.exits, args.seed, args.solver or list(SOLVERS), args.maze)
+
+def bench_explore_main(argv):
+    parser = argparse.ArgumentParser(prog="лабиринт.py bench-explore")
+    parser.add_argument("--size", type=int, default=2001)
+    parser.add_argument("--exits", type=int, default=4)
+    parser.add_argument("--agents", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--threads", action="store_true", help="потоки вместо процессов")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--maze", help="файл лабиринта (.txt или бинарный)")
+    args = parser.parse_args(argv)
+    benchmark_exploration(args.size, args.exits, args.seed, args.agents, args.threads, args.maze)
+
+def bench_field_main(argv):
+    parser = argparse.ArgumentParser(prog="лабиринт.py bench-field")
+    parser.add_argument("--size", type=int, default=1001)
+    parser.add_argument("--exits", type=int, default=16)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--toggles", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+    benchmark_distance_field(args.size, args.exits, args.queries, args.toggles, args.seed)
+
+def make_maze_main(argv):
+    parser = argparse.ArgumentParser(prog="лабиринт.py make-maze")
+    parser.add_argument("output")
+    parser.add_argument("--size", type=int, default=1001)
+    parser.add_argument("--mode", choices=MAZE_MODES, default="dfs")
+    parser.add_argument("--exits", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+    start, exits = random_task(args.size, args.exits, random.Random(args.seed))
+    if args.mode == "eller":
+        rows = eller_rows(args.size, args.size, rng)
+    else:
+        rows = generate_maze(args.size, args.size, args.mode, rng)
+    write_maze_file(args.output, rows, start, exits)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == "bench-gen":
+        bench_main(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == "bench-solve":
+        bench_solve_main(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == "bench-explore":
+        bench_explore_main(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == "bench-field":
+        bench_field_main(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == "make-maze":
+        make_maze_main(sys.argv[2:])
+    else:
+        if len(sys.argv) > 2:
+            main(int(sys.argv[1]), int(sys.argv[2]))
+        else:
+            main()
\ No newline at end of file